@@ -0,0 +1,269 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from markdown_to_project import rebuild_project
+from project_files_extractor_with_zip import process_zip_to_markdown
+
+try:
+    import resource  # Not available on Windows; peak RSS is then reported as null
+except ImportError:
+    resource = None
+
+# Text used to synthesize archive members; Go-like so it resembles real input
+SAMPLE_LINES = [
+    "package handlers\n",
+    "\n",
+    "func (h *Handler) Transfer(c *gin.Context) {\n",
+    "    var req models.TransferRequest // naïve comment with ünïcode\n",
+    "    if err := c.ShouldBindJSON(&req); err != nil {\n",
+    "        c.JSON(http.StatusBadRequest, gin.H{\"error\": err.Error()})\n",
+    "        return\n",
+    "    }\n",
+    "}\n",
+]
+
+def synthesize_text(size, rng):
+    """Build roughly ``size`` bytes of source-like text."""
+    parts = []
+    total = 0
+    while total < size:
+        line = rng.choice(SAMPLE_LINES)
+        parts.append(line)
+        total += len(line.encode('utf-8'))
+    return ''.join(parts)
+
+def build_large_archive(zip_path, size_mb, file_mb=8, seed=1):
+    """Write a synthetic archive of about ``size_mb`` MB, alternating stored and deflated members."""
+    rng = random.Random(seed)
+    block = synthesize_text(file_mb * 1024 * 1024, rng).encode('utf-8')
+    count = max(1, size_mb // file_mb)
+    with zipfile.ZipFile(zip_path, 'w') as zipf:
+        for i in range(count):
+            method = zipfile.ZIP_STORED if i % 2 == 0 else zipfile.ZIP_DEFLATED
+            zipf.writestr(f"pkg{i // 16:03d}/file_{i:04d}.go", block, compress_type=method)
+    return count * len(block)
+
+# Builders for the suite's archive shapes; each returns the total uncompressed payload in bytes
+def _build_uniform(zip_path, rng, count, size, method, depth=1):
+    block = synthesize_text(size, rng).encode('utf-8')
+    with zipfile.ZipFile(zip_path, 'w', method) as zipf:
+        for i in range(count):
+            directory = '/'.join(f"d{(i + level) % 7}" for level in range(depth))
+            zipf.writestr(f"{directory}/file_{i:06d}.go", block)
+    return count * len(block)
+
+def _build_mixed_binary(zip_path, rng, count, size):
+    text = synthesize_text(size, rng).encode('utf-8')
+    total = 0
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for i in range(count):
+            kind = i % 4
+            if kind == 0:
+                name, data = f"src/file_{i:05d}.go", text
+            elif kind == 1:
+                name, data = f"assets/img_{i:05d}.png", rng.randbytes(size)
+            elif kind == 2:
+                name, data = f"bin/blob_{i:05d}", b'\x00' + rng.randbytes(size - 1)
+            else:
+                name, data = f"notes/NOTES_{i:05d}", text  # extensionless text, needs sniffing
+            zipf.writestr(name, data)
+            total += len(data)
+    return total
+
+# Archive shapes for the suite, file counts and sizes scaled by --scale
+SHAPES = {
+    'tiny_files': lambda path, rng, scale: _build_uniform(
+        path, rng, int(20000 * scale), 200, zipfile.ZIP_DEFLATED),
+    'huge_files': lambda path, rng, scale: _build_uniform(
+        path, rng, 4, int(32 * 1024 * 1024 * scale), zipfile.ZIP_DEFLATED),
+    'deep_nesting': lambda path, rng, scale: _build_uniform(
+        path, rng, int(2000 * scale), 2048, zipfile.ZIP_DEFLATED, depth=30),
+    'mixed_binary': lambda path, rng, scale: _build_mixed_binary(
+        path, rng, int(2000 * scale), 16 * 1024),
+    'stored': lambda path, rng, scale: _build_uniform(
+        path, rng, int(200 * scale), 256 * 1024, zipfile.ZIP_STORED),
+    'deflated': lambda path, rng, scale: _build_uniform(
+        path, rng, int(200 * scale), 256 * 1024, zipfile.ZIP_DEFLATED),
+}
+
+def time_conversion(zip_path, output_md_path, repeat, **options):
+    """Return the best wall time over ``repeat`` runs of process_zip_to_markdown."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        success, message = process_zip_to_markdown(zip_path, output_md_path, show_progress=False, **options)
+        elapsed = time.perf_counter() - start
+        if not success:
+            raise RuntimeError(message)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _measure_case(zip_path, output_md_path, repeat, options):
+    """Child-process body: time the conversion and report this process's peak RSS."""
+    seconds = time_conversion(zip_path, output_md_path, repeat, **options)
+    return seconds, _peak_rss_mb()
+
+def run_suite(shapes, scale, repeat, work_dir, options):
+    """Build each archive shape and measure it in a fresh process, so peak RSS is per case."""
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for name in shapes:
+        zip_path = os.path.join(work_dir, f"{name}.zip")
+        output_md_path = os.path.join(work_dir, f"{name}.md")
+        payload = SHAPES[name](zip_path, random.Random(name), scale)
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            seconds, peak_rss = executor.submit(_measure_case, zip_path, output_md_path, repeat, options).result()
+
+        results[name] = {
+            'seconds': round(seconds, 4),
+            'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+            'mb_per_s': round(payload / 1e6 / seconds, 2),
+            'input_mb': round(payload / 1e6, 2),
+            'archive_mb': round(os.path.getsize(zip_path) / 1e6, 2),
+        }
+        rss = f"{peak_rss:8.1f} MB" if peak_rss is not None else "     n/a"
+        print(f"{name:>14}: {seconds:7.2f}s  {results[name]['mb_per_s']:8.1f} MB/s  peak RSS {rss}")
+        os.remove(zip_path)
+        os.remove(output_md_path)
+    return results
+
+def compare_results(current, baseline, threshold):
+    """Print per-case deltas against a baseline; return the names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':>14}  {'time':>9}  {'MB/s':>9}  {'peak RSS':>9}")
+    for name, result in current.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:>14}  (not in baseline)")
+            continue
+
+        def delta(key):
+            if result.get(key) is None or not old.get(key):
+                return None
+            return (result[key] - old[key]) / old[key] * 100
+
+        changes = {key: delta(key) for key in ('seconds', 'mb_per_s', 'peak_rss_mb')}
+        cells = [f"{changes[key]:+8.1f}%" if changes[key] is not None else "      n/a"
+                 for key in ('seconds', 'mb_per_s', 'peak_rss_mb')]
+        regressed = any(changes[key] is not None and changes[key] > threshold for key in ('seconds', 'peak_rss_mb'))
+        if regressed:
+            regressions.append(name)
+        print(f"{name:>14}  {'  '.join(cells)}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def run_mmap_benchmark(size_mb, repeat, work_dir):
+    """Compare buffered file I/O against the mmap reader on one large archive."""
+    zip_path = os.path.join(work_dir, "synthetic.zip")
+    output_md_path = os.path.join(work_dir, "all_files.md")
+
+    print(f"Building {size_mb} MB synthetic archive...")
+    payload = build_large_archive(zip_path, size_mb)
+    print(f"Archive: {os.path.getsize(zip_path) / 1e6:.1f} MB on disk, {payload / 1e6:.1f} MB uncompressed")
+
+    results = {}
+    for label, use_mmap in (("buffered", False), ("mmap", True)):
+        seconds = time_conversion(zip_path, output_md_path, repeat, use_mmap=use_mmap)
+        results[label] = seconds
+        print(f"{label:>8}: {seconds:7.2f}s  {payload / 1e6 / seconds:8.1f} MB/s")
+
+    print(f"mmap speedup: {results['buffered'] / results['mmap']:.2f}x")
+    return results
+
+def run_roundtrip_benchmark(size_mb, repeat, work_dir):
+    """Compare forward (ZIP to Markdown) and reverse (Markdown to ZIP/tree) throughput."""
+    zip_path = os.path.join(work_dir, "synthetic.zip")
+    output_md_path = os.path.join(work_dir, "all_files.md")
+    payload = _build_uniform(zip_path, random.Random(size_mb), max(1, size_mb * 4), 256 * 1024,
+                             zipfile.ZIP_DEFLATED)
+    print(f"Synthetic archive: {payload / 1e6:.1f} MB uncompressed")
+
+    forward = time_conversion(zip_path, output_md_path, repeat)
+    print(f"{'forward':>16}: {forward:7.2f}s  {payload / 1e6 / forward:8.1f} MB/s")
+
+    for label, target in (("reverse to zip", "rebuilt.zip"), ("reverse to tree", "rebuilt")):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rebuild_project([output_md_path], os.path.join(work_dir, target))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{label:>16}: {best:7.2f}s  {payload / 1e6 / best:8.1f} MB/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process_zip_to_markdown on synthetic archives.")
+    parser.add_argument('--work-dir', help="Directory for synthetic archives (default: a temp dir)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement; the best time is reported")
+    modes = parser.add_subparsers(dest='mode')
+
+    suite = modes.add_parser('suite', help="Run every archive shape and record the results as JSON (default)")
+    suite.add_argument('--shapes', nargs='+', choices=sorted(SHAPES), default=list(SHAPES),
+                       help="Subset of archive shapes to run")
+    suite.add_argument('--scale', type=float, default=1.0, help="Multiply file counts/sizes by this factor")
+    suite.add_argument('--mmap', action='store_true', help="Convert with use_mmap=True")
+    suite.add_argument('--output', default="benchmark_results.json", help="Where to write the JSON results")
+    suite.add_argument('--baseline', help="Earlier results JSON to compare against")
+    suite.add_argument('--threshold', type=float, default=10.0,
+                       help="Percent slowdown or RSS growth reported as a regression (default: 10)")
+
+    mmap_mode = modes.add_parser('mmap', help="Compare buffered and mmap reading on one large archive")
+    mmap_mode.add_argument('--size-mb', type=int, default=300, help="Synthetic archive size in MB (default: 300)")
+
+    roundtrip = modes.add_parser('roundtrip', help="Compare Markdown generation and markdown_to_project throughput")
+    roundtrip.add_argument('--size-mb', type=int, default=100, help="Synthetic payload size in MB (default: 100)")
+
+    args = parser.parse_args()
+    if args.mode is None:
+        args = parser.parse_args(sys.argv[1:] + ['suite'])
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        if args.mode == 'mmap':
+            run_mmap_benchmark(args.size_mb, args.repeat, work_dir)
+            return
+        if args.mode == 'roundtrip':
+            run_roundtrip_benchmark(args.size_mb, args.repeat, work_dir)
+            return
+
+        results = run_suite(args.shapes, args.scale, args.repeat, work_dir, {'use_mmap': args.mmap})
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': args.scale,
+            'repeat': args.repeat,
+            'mmap': args.mmap,
+        },
+        'cases': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['cases']
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import posixpath
+import sys
+import time
+import zipfile
+
+# Rebuilds a project tree (or ZIP) from the Markdown bundle written by
+# project_files_extractor_with_zip.py: a "## <path>" heading followed by a
+# fenced block per file. The bundle is parsed in fixed-size blocks, so memory
+# use does not depend on the bundle or file sizes.
+
+FENCE = "```"  # The shortest fence; the extractor lengthens it past any backtick-only line in the file
+NO_FINAL_NEWLINE = 'no-final-newline'  # Opening fence attribute: drop the newline before the closing fence
+READ_BUFFER = 1024 * 1024  # Characters read from the bundle per block
+
+class DirectorySink:
+    """Writes rebuilt files below a directory."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def open(self, path):
+        target = os.path.join(self.root, *path.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        return open(target, 'wb')
+
+    def close(self):
+        pass
+
+class ZipSink:
+    """Writes rebuilt files into a new ZIP archive, streaming each member."""
+
+    def __init__(self, zip_path, compresslevel=1):
+        # Level 1 keeps the rebuild about as fast as the forward conversion
+        self.zip_file = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+
+    def open(self, path):
+        return self.zip_file.open(path, 'w')
+
+    def close(self):
+        self.zip_file.close()
+
+def safe_member_path(path):
+    """Normalise a heading path; None if it is absolute or escapes the output root."""
+    path = path.strip().replace('\\', '/')
+    normalised = posixpath.normpath(path)
+    if not path or path.startswith('/') or normalised == '..' or normalised.startswith('../') or ':' in normalised:
+        return None
+    return normalised
+
+class BundleError(ValueError):
+    """The bundle cannot be split into files unambiguously."""
+
+class BundleParser:
+    """Streaming parser for the ``## path`` + fenced-block format.
+
+    A block is closed only by a line that is exactly its opening fence. The
+    extractor makes each fence longer than any backtick-only line in the file,
+    so file contents cannot close it early. Bundles written before that (with
+    plain ``` fences around files that contain them) can still be misread; the
+    parser raises BundleError when a closing fence is followed by anything but
+    a blank line, an ``**Error**`` note, the next ``## path`` heading or end of
+    input, instead of guessing. The closing fence always starts its own line;
+    when the opening fence line carries NO_FINAL_NEWLINE the newline before it
+    was added by the extractor and is dropped.
+
+    Text is read in READ_BUFFER blocks and file bodies are located with
+    ``str.find`` on line-start fences, so content is copied out in large slices
+    instead of line by line.
+    """
+
+    def __init__(self, md_file, name='<bundle>'):
+        self._file = md_file
+        self._name = name
+        self._buf = ''
+        self._pos = 0
+
+    def _more(self):
+        """Append the next block to the buffer, dropping consumed text; False at end of input."""
+        data = self._file.read(READ_BUFFER)
+        if not data:
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def _peek_line(self, offset):
+        """The line starting ``offset`` characters past the read position, or None at end of input."""
+        while True:
+            start = self._pos + offset
+            newline = self._buf.find('\n', start)
+            if newline != -1:
+                return self._buf[start:newline + 1]
+            if not self._more():
+                return self._buf[start:] or None
+
+    def _take_line(self):
+        line = self._peek_line(0)
+        if line is not None:
+            self._pos += len(line)
+        return line
+
+    def sections(self):
+        """Yield ``(path, chunk_iterator)`` per file; each iterator must be drained before the next."""
+        path = None  # The section just closed, while its trailing text is being checked
+        while (line := self._take_line()) is not None:
+            if not line.startswith('## '):
+                if path is not None and line.rstrip('\r\n') and not line.startswith('**Error**'):
+                    raise BundleError(f"{self._name}: ambiguous section '{path}': text follows its closing "
+                                      f"fence, so the file may contain a fence line of its own")
+                continue
+            path = line[3:].rstrip('\r\n')
+            opening = self._peek_line(0)
+            if opening is None or not opening.startswith(FENCE):
+                continue  # "**Error**" sections carry no content
+            self._pos += len(opening)
+            fence = opening[:len(opening) - len(opening.lstrip('`'))]
+            body = self._body(fence)
+            if NO_FINAL_NEWLINE in opening[len(fence):].split():
+                body = _without_final_newline(body)
+            yield path, body
+
+    def _body(self, fence):
+        # The read position is always at the start of a line here
+        while True:
+            line = self._peek_line(0)
+            if line is None:
+                return
+            if line.startswith(fence) and line.rstrip('\r\n') == fence:
+                self._pos += len(line)
+                return
+
+            buf, pos = self._buf, self._pos
+            candidate = buf.find('\n' + fence, pos)
+            if candidate != -1:
+                end = candidate + 1
+            else:
+                # No fence in the buffer: emit up to the last complete line
+                end = buf.rfind('\n', pos) + 1
+                if end == 0:
+                    if not self._more():
+                        self._pos = len(self._buf)
+                        yield buf[pos:]
+                        return
+                    continue
+            self._pos = end
+            yield buf[pos:end]
+
+def _without_final_newline(chunks):
+    """Pass ``chunks`` through, minus the newline that ends the last one."""
+    pending = ''
+    for chunk in chunks:
+        if pending:
+            yield pending
+        pending = chunk
+    yield pending[:-1] if pending.endswith('\n') else pending
+
+def expand_bundle_inputs(paths):
+    """Expand ``*.manifest.json`` files from split output into their part files, in order."""
+    expanded = []
+    for path in paths:
+        if path.endswith('.manifest.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            directory = os.path.dirname(path)
+            expanded.extend(os.path.join(directory, part['file']) for part in manifest['parts'])
+        else:
+            expanded.append(path)
+    return expanded
+
+def rebuild_project(md_paths, output_path, stats=None, compresslevel=1):
+    """Rebuild files from one or more Markdown bundles into a directory or a ``.zip``."""
+    if output_path.lower().endswith('.zip'):
+        sink = ZipSink(output_path, compresslevel=compresslevel)
+    else:
+        sink = DirectorySink(output_path)
+    files = skipped = written = 0
+    seen = set()
+    try:
+        for md_path in expand_bundle_inputs(md_paths):
+            # newline='' keeps CRLF content intact; output files are written as raw bytes
+            with open(md_path, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER) as md_file:
+                for path, body in BundleParser(md_file, md_path).sections():
+                    if path in seen:
+                        raise BundleError(f"{md_path}: '{path}' appears twice; an earlier file probably "
+                                          f"contains a section of its own")
+                    seen.add(path)
+                    member = safe_member_path(path)
+                    if member is None:
+                        print(f"Skipping unsafe path: {path}", file=sys.stderr)
+                        skipped += 1
+                        for _ in body:
+                            pass
+                        continue
+                    with sink.open(member) as out:
+                        for chunk in body:
+                            data = chunk.encode('utf-8')
+                            out.write(data)
+                            written += len(data)
+                    files += 1
+    finally:
+        sink.close()
+
+    if stats is not None:
+        stats.update(files=files, skipped=skipped, bytes=written)
+    return files
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild a project tree or ZIP from an all_files.md bundle.")
+    parser.add_argument('bundles', nargs='+',
+                        help="Markdown bundle(s), or a .manifest.json from split output, in order")
+    parser.add_argument('-o', '--output', required=True, help="Output directory, or a path ending in .zip")
+    parser.add_argument('--compress-level', type=int, default=1, choices=range(10), metavar='0-9',
+                        help="Deflate level for ZIP output (default: 1)")
+    args = parser.parse_args()
+
+    for path in args.bundles:
+        if not os.path.exists(path):
+            print(f"Error: '{path}' does not exist.")
+            return
+
+    stats = {}
+    start = time.perf_counter()
+    try:
+        rebuild_project(args.bundles, args.output, stats=stats, compresslevel=args.compress_level)
+    except BundleError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Rebuilt {stats['files']} files ({stats['bytes'] / 1e6:.1f} MB) into {args.output} "
+          f"in {elapsed:.2f}s ({stats['bytes'] / 1e6 / elapsed:.1f} MB/s)")
+    if stats['skipped']:
+        print(f"Skipped {stats['skipped']} file(s) with unsafe paths")
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,22 @@ import zipfile
 import os
 from pathlib import Path
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import sys
 from tqdm import tqdm  # For progress bar
+import codecs
 import io
+import mmap
+import struct
+import zlib
+import argparse
+import glob
+import json
+import re
+import time
+import threading
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 # Define text-based file extensions to process
 TEXT_EXTENSIONS = {
@@ -25,68 +37,882 @@ TEXT_EXTENSIONS = {
     '.sh': 'bash',
     '.yaml': 'yaml',
     '.yml': 'yaml',
-    '.txt': 'text'
+    '.txt': 'text',
+    '.bat': 'batch',
+    '.env': 'bash',
 }
 
-def is_text_file(filename):
-    """Check if the file has a text-based extension."""
-    return any(filename.lower().endswith(ext) for ext in TEXT_EXTENSIONS)
+# Well-known text files that have no (or a misleading) extension, keyed by lower-cased basename
+TEXT_FILENAMES = {
+    'makefile': 'makefile',
+    'dockerfile': 'dockerfile',
+    'go.mod': 'go',
+    'go.sum': 'text',
+    'go.work': 'go',
+    'go.work.sum': 'text',
+    '.env': 'bash',
+    '.env.example': 'bash',
+    '.gitignore': 'text',
+    'license': 'text',
+}
+
+# Extensions that are never worth sniffing
+BINARY_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.pdf',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.jar',
+    '.exe', '.dll', '.so', '.dylib', '.a', '.o', '.class', '.pyc',
+    '.woff', '.woff2', '.ttf', '.otf', '.mp3', '.mp4', '.mov', '.wav',
+})
+
+SNIFF_SIZE = 4096  # Bytes inspected when the name alone does not decide
+
+def classify_filename(filename):
+    """Classify a path by name: True for text, False for known binary, None if unknown."""
+    basename = filename.rsplit('/', 1)[-1].lower()
+    if basename in TEXT_FILENAMES:
+        return True
+    suffix = os.path.splitext(basename)[1]
+    if suffix in TEXT_EXTENSIONS:
+        return True
+    if suffix in BINARY_EXTENSIONS:
+        return False
+    return None
+
+def looks_like_text(head):
+    """Sniff a leading sample of bytes: no NUL bytes and valid (possibly truncated) UTF-8."""
+    if b'\x00' in head:
+        return False
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def is_text_member(open_member, info):
+    """Decide whether an archive member is text, sniffing its first bytes only if the name is unknown."""
+    verdict = classify_filename(info.filename)
+    if verdict is not None:
+        return verdict
+    try:
+        with open_member(info) as file:
+            return looks_like_text(bytes(file.read(SNIFF_SIZE)))
+    except Exception:
+        return False
 
 def get_language_from_extension(filename):
     """Get the language for syntax highlighting based on file extension."""
+    basename = filename.rsplit('/', 1)[-1].lower()
+    if basename in TEXT_FILENAMES:
+        return TEXT_FILENAMES[basename]
     ext = Path(filename).suffix.lower()
     return TEXT_EXTENSIONS.get(ext, 'text')
 
-def process_zip_to_markdown(zip_path, output_md_path):
-    """Process a ZIP file and combine text-based files into a single Markdown file."""
+IGNORE_FILENAMES = ('.gitignore', '.extractignore')  # Read in this order, so .extractignore wins
+
+def _translate_glob(pattern):
+    """Translate a gitignore-style glob into a regex fragment (``*`` never crosses ``/``)."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                if i + 2 < n and pattern[i + 2] == '/':
+                    out.append('(?:.*/)?')  # '**/' matches zero or more directories
+                    i += 3
+                elif i + 2 == n and i > 0 and pattern[i - 1] == '/':
+                    out.append('.+')  # A trailing '/**' matches what is inside, not the directory itself
+                    i += 2
+                else:
+                    out.append('.*')
+                    i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[' and pattern.find(']', i + 2) != -1:
+            end = pattern.find(']', i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+            continue
+        elif c == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+def compile_ignore_rule(line, base=''):
+    """Compile one ``.gitignore`` line found in directory ``base`` into ``(negated, regex)``.
+
+    Returns None for blank lines and comments, otherwise
+    ``(negated, dir_only, regex)``. The regex matches the member path of an
+    ignored file or directory, without a trailing ``/``; ``dir_only`` rules
+    (a trailing ``/`` in the pattern) only match directories. PathMatcher
+    applies directory matches to everything below.
+    """
+    line = line.rstrip('\r\n').rstrip()
+    if not line or line.startswith('#'):
+        return None
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    anchored = '/' in line
+    line = line.lstrip('/')
+    if not line:
+        return None
+
+    head = re.escape(base) if anchored else re.escape(base) + '(?:.*/)?'
+    return negated, dir_only, head + _translate_glob(line)
+
+class PathMatcher:
+    """All ignore rules compiled into one regex, so each path costs a single match.
+
+    Alternatives are joined in reverse so the first alternative that matches is
+    the last rule in file order, which is the one that wins under gitignore rules.
+    As in git, a negated rule cannot re-include a path whose parent directory is
+    itself matched, so each parent directory is checked first (once per directory).
+    """
+
+    def __init__(self, rules):
+        self._negated = {}
+        self._directories = {}
+        file_alternatives, directory_alternatives = [], []
+        for index, (negated, dir_only, regex) in reversed(list(enumerate(rules))):
+            self._negated[f"r{index}"] = negated
+            if not dir_only:
+                file_alternatives.append(f"(?P<r{index}>{regex})")
+            directory_alternatives.append(f"(?P<r{index}>{regex})")
+        self._file_regex = re.compile('|'.join(file_alternatives)) if file_alternatives else None
+        self._directory_regex = re.compile('|'.join(directory_alternatives)) if directory_alternatives else None
+
+    def matches(self, path):
+        """True if file ``path`` or one of its parent directories is matched by a positive pattern."""
+        if self._directory_regex is None:
+            return False
+        parent = path.rfind('/')
+        if parent != -1 and self._matches_directory(path[:parent]):
+            return True
+        return self._decides(self._file_regex, path)
+
+    def _matches_directory(self, directory):
+        """Like matches() for a directory path (no trailing ``/``), caching the result."""
+        result = self._directories.get(directory)
+        if result is None:
+            parent = directory.rfind('/')
+            result = ((parent != -1 and self._matches_directory(directory[:parent]))
+                      or self._decides(self._directory_regex, directory))
+            self._directories[directory] = result
+        return result
+
+    def _decides(self, regex, path):
+        """True if the deciding rule for ``path`` itself is a positive (non-negated) pattern."""
+        match = regex.fullmatch(path) if regex is not None else None
+        return match is not None and not self._negated[match.lastgroup]
+
+class IgnoreConfig:
+    """Which paths to leave out of the Markdown output.
+
+    ``exclude`` and ``include`` are gitignore-style globs from the command
+    line; when ``include`` is non-empty only matching paths are kept.
+    ``ignore_files`` are extra pattern files applied at the input root, and
+    ``use_tree_ignore_files`` honours ``.gitignore``/``.extractignore`` files
+    found inside the input itself.
+    """
+
+    def __init__(self, exclude=(), include=(), ignore_files=(), use_tree_ignore_files=True):
+        self.exclude = list(exclude)
+        self.include = list(include)
+        self.ignore_files = list(ignore_files)
+        self.use_tree_ignore_files = use_tree_ignore_files
+
+def build_path_filter(config, names, read_text):
+    """Compile ``config`` plus any in-tree ignore files into a ``keep(path)`` predicate.
+
+    ``read_text(name)`` returns the contents of an in-tree ignore file. Rules
+    are ordered from lowest to highest precedence: extra ignore files, in-tree
+    files from shallowest to deepest, then ``--exclude`` globs.
+    """
+    config = config or IgnoreConfig()
+    lines = []
+    for path in config.ignore_files:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            lines.extend((line, '') for line in f)
+
+    if config.use_tree_ignore_files:
+        ignore_names = [name for name in names if name.rsplit('/', 1)[-1] in IGNORE_FILENAMES]
+        ignore_names.sort(key=lambda name: (name.count('/'), os.path.dirname(name),
+                                            IGNORE_FILENAMES.index(name.rsplit('/', 1)[-1])))
+        for name in ignore_names:
+            base = name[:name.rfind('/') + 1]
+            lines.extend((line, base) for line in read_text(name).splitlines())
+
+    lines.extend((pattern, '') for pattern in config.exclude)
+    ignored = PathMatcher([rule for rule in (compile_ignore_rule(line, base) for line, base in lines) if rule])
+    included = PathMatcher([rule for rule in map(compile_ignore_rule, config.include) if rule])
+
+    if config.include:
+        return lambda path: included.matches(path) and not ignored.matches(path)
+    return lambda path: not ignored.matches(path)
+
+CHUNK_SIZE = 8192  # Bytes read from an archive member per iteration
+PREFETCH_MAX_BYTES = 1 << 20  # Larger directory files are streamed from disk instead of read ahead
+SCAN_KEEP_BYTES = 1 << 20  # Members up to this size are read once; larger ones are read again to write them
+NO_FINAL_NEWLINE = 'no-final-newline'  # Opening fence attribute: the newline before the closing fence was added
+
+class FenceScanner:
+    """Finds a fence that no line of a member's raw bytes can close.
+
+    A fenced block is closed by a line of backticks at least as long as its
+    opening fence, so fence() returns one backtick longer than any line that
+    could become one. The scan runs on the undecoded bytes: a backtick is ASCII
+    and never part of a multibyte UTF-8 sequence. Invalid bytes are dropped
+    when the body is decoded, which could join backtick runs, so lines holding
+    only backticks, blanks and non-ASCII bytes count all their backticks; the
+    fence errs long, never short. Only the unfinished last line is carried
+    between chunks, reduced to its backticks.
+    """
+
+    FENCE_LINE = re.compile(rb'^[ \t\r\x80-\xff]*`[ `\t\r\x80-\xff]*$', re.MULTILINE)
+    NOT_FENCE = re.compile(rb'[^ `\t\r\x80-\xff]')
+
+    def __init__(self):
+        self.longest = 0
+        self.ends_with_newline = True  # An empty member needs no newline either
+        self._partial = b''
+
+    def feed(self, data):
+        if not data:
+            return
+        self.ends_with_newline = data.endswith(b'\n')
+        end = data.rfind(b'\n') + 1
+        if end and b'`' not in data and not self._partial:
+            partial = data[end:]  # The common case; a one-byte search is a fast memchr
+        elif end:
+            self._scan(self._partial + data[:end])
+            partial = data[end:]
+        else:
+            partial = self._partial + data
+        if self.NOT_FENCE.search(partial):
+            self._partial = b'x'  # Cannot become a fence line any more; keep it short
+        else:
+            self._partial = b'`' * partial.count(b'`')
+
+    def _scan(self, data):
+        if data.count(b'`') < 3:
+            return  # Lines with fewer backticks never lengthen the shortest fence
+        for match in self.FENCE_LINE.finditer(data):
+            self.longest = max(self.longest, match.group().count(b'`'))
+
+    def fence(self):
+        self._scan(self._partial)
+        self._partial = b''
+        return '`' * max(3, self.longest + 1)
+
+def _read_chunks(open_file):
+    with open_file() as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+def write_markdown_section(open_file, file_path, md_file, cache_file=None):
+    """Stream one member into ``md_file`` as a ``## path`` heading plus fenced block.
+
+    ``open_file()`` returns a new binary file object for the member each time
+    it is called. The member is scanned first for its fence (see FenceScanner);
+    members of up to SCAN_KEEP_BYTES are kept from that pass, larger ones are
+    opened again (re-inflated, or re-read from disk) and streamed, so memory
+    stays bounded by SCAN_KEEP_BYTES whatever the member's size.
+
+    Chunks are decoded with an incremental UTF-8 decoder so multibyte characters
+    split across chunk boundaries survive. A member that does not end with a
+    newline gets one so the closing fence starts its own line, and the opening
+    fence line carries NO_FINAL_NEWLINE so the rebuild drops it again. When
+    ``cache_file`` is given the opening fence and body are also copied into it.
+    Returns False if the member failed part-way through.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    language = get_language_from_extension(file_path)
+    scanner = FenceScanner()
+
+    kept, size = [], 0
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # Get list of all files in the ZIP, filter text files upfront
-            file_list = [f for f in sorted(zip_ref.namelist()) if not f.endswith('/') and is_text_file(f)]
-            
-            # Use a buffered writer to reduce I/O overhead
-            with open(output_md_path, 'w', encoding='utf-8', buffering=8192) as md_file:
-                # Progress bar for large file counts
-                for file_path in tqdm(file_list, desc="Processing files", unit="file"):
-                    try:
-                        with zip_ref.open(file_path, 'r') as file:
-                            # Read file in chunks to handle large files
-                            content = io.StringIO()
-                            try:
-                                while chunk := file.read(8192):  # Read 8KB chunks
-                                    content.write(chunk.decode('utf-8', errors='ignore'))
-                            except UnicodeDecodeError:
-                                # Skip files that can't be decoded as text
-                                md_file.write(f"## {file_path}\n")
-                                md_file.write("**Error**: File could not be decoded as text\n\n")
-                                continue
-                            
-                            # Write file path as heading
-                            md_file.write(f"## {file_path}\n")
-                            
-                            # Write content in fenced code block with language
-                            language = get_language_from_extension(file_path)
-                            md_file.write(f"```{language}\n")
-                            content_str = content.getvalue()
-                            md_file.write(content_str)
-                            # Ensure code block is properly closed
-                            if not content_str.endswith('\n'):
-                                md_file.write('\n')
-                            md_file.write("```\n\n")
-                            
-                            # Clean up to free memory
-                            content.close()
-                            
-                    except Exception as e:
-                        # Log error and continue with next file
-                        md_file.write(f"## {file_path}\n")
-                        md_file.write(f"**Error**: Could not process file: {str(e)}\n\n")
-                        
-        return True, f"Markdown file generated successfully: {output_md_path}"
+        for chunk in _read_chunks(open_file):
+            chunk = bytes(chunk)  # Mapped members hand out memoryviews
+            scanner.feed(chunk)
+            if kept is not None:
+                kept.append(chunk)
+                size += len(chunk)
+                if size > SCAN_KEEP_BYTES:
+                    kept = None
+    except Exception as e:
+        md_file.write(f"## {file_path}\n")
+        md_file.write(f"**Error**: Could not process file: {str(e)}\n\n")
+        return False
+
+    fence = scanner.fence()
+    opening = fence if scanner.ends_with_newline else f"{fence} {NO_FINAL_NEWLINE}"
+    md_file.write(f"## {file_path}\n")
+    md_file.write(f"{fence}{language}{opening[len(fence):]}\n")
+    if cache_file is not None:
+        cache_file.write(f"{opening}\n")
+
+    def write(text):
+        md_file.write(text)
+        if cache_file is not None:
+            cache_file.write(text)
+
+    try:
+        for chunk in kept if kept is not None else _read_chunks(open_file):
+            write(decoder.decode(chunk))
+        write(decoder.decode(b'', final=True))
+    except Exception as e:
+        md_file.write(f"\n{fence}\n\n**Error**: Could not process file: {str(e)}\n\n")
+        return False
+    if not scanner.ends_with_newline:
+        write('\n')
+    md_file.write(f"{fence}\n\n")
+    return True
+
+class MappedMember:
+    """File-like reader for one archive member served from an ``mmap`` of the ZIP.
+
+    Stored members are returned as zero-copy ``memoryview`` slices of the map;
+    deflated members are inflated incrementally from the mapped bytes. The CRC32
+    is checked once the member has been fully read, as ``zipfile`` does.
+    """
+
+    LOCAL_HEADER_SIZE = 30
+    SUPPORTED_METHODS = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+    def __init__(self, mapped, info):
+        header = memoryview(mapped)[info.header_offset:info.header_offset + self.LOCAL_HEADER_SIZE]
+        if bytes(header[:4]) != b'PK\x03\x04':
+            header.release()
+            raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+        name_length, extra_length = struct.unpack_from('<HH', header, 26)
+        header.release()
+
+        start = info.header_offset + self.LOCAL_HEADER_SIZE + name_length + extra_length
+        self._view = memoryview(mapped)[start:start + info.compress_size]
+        self._pos = 0
+        self._crc = 0
+        self._expected_crc = info.CRC
+        self._name = info.filename
+        self._decompressor = zlib.decompressobj(-15) if info.compress_type == zipfile.ZIP_DEFLATED else None
+
+    @classmethod
+    def supports(cls, info):
+        """Whether ``info`` can be read from the map (unencrypted, stored or deflated)."""
+        return info.compress_type in cls.SUPPORTED_METHODS and not info.flag_bits & 0x1
+
+    def read(self, size=CHUNK_SIZE):
+        if self._decompressor is None:
+            chunk = self._view[self._pos:self._pos + size]
+            self._pos += len(chunk)
+        else:
+            chunk = self._inflate(size)
+        if chunk:
+            self._crc = zlib.crc32(chunk, self._crc)
+        elif self._crc != self._expected_crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {self._name!r}")
+        return chunk
+
+    def _inflate(self, size):
+        while True:
+            if self._decompressor.unconsumed_tail:
+                data = self._decompressor.unconsumed_tail
+            elif self._pos < len(self._view):
+                data = self._view[self._pos:self._pos + CHUNK_SIZE]
+                self._pos += len(data)
+            else:
+                return self._decompressor.flush()
+            out = self._decompressor.decompress(data, size)
+            if out:
+                return out
+
+    def close(self):
+        self._view.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _member_opener(zip_ref, mapped):
+    """Return a callable that opens a member, from the map when one is available."""
+    def open_member(info):
+        if mapped is not None and MappedMember.supports(info):
+            return MappedMember(mapped, info)
+        return zip_ref.open(info, 'r')
+    return open_member
+
+def _cache_entry_path(cache_dir, info):
+    """Cache file for a member, addressed by the CRC32 and size from the central directory."""
+    return os.path.join(cache_dir, f"{info.CRC:08x}-{info.file_size}.section")
+
+def write_cached_section(open_member, info, md_file, cache_dir):
+    """Write a member's section, reusing the cached fence and body when CRC32 and size match.
+
+    Only cache misses are decompressed; their opening fence (with any
+    attribute) and rendered body are stored for the next run. Returns True on
+    a cache hit.
+    """
+    entry_path = _cache_entry_path(cache_dir, info)
+    if os.path.exists(entry_path):
+        language = get_language_from_extension(info.filename)
+        with open(entry_path, 'r', encoding='utf-8', newline='') as cached:
+            opening = cached.readline().rstrip('\n')
+            fence = opening[:len(opening) - len(opening.lstrip('`'))]
+            md_file.write(f"## {info.filename}\n")
+            md_file.write(f"{fence}{language}{opening[len(fence):]}\n")
+            while text := cached.read(CHUNK_SIZE):
+                md_file.write(text)
+        md_file.write(f"{fence}\n\n")
+        return True
+
+    # Write to a temporary file first so an interrupted run never leaves a partial entry
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as cache_file:
+            complete = write_markdown_section(lambda: open_member(info), info.filename, md_file,
+                                              cache_file=cache_file)
+        if complete:
+            os.replace(tmp_path, entry_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return False
+
+BYTES_PER_TOKEN = 4  # Rough bytes-per-token ratio used for token budgets
+
+class PartedMarkdownWriter:
+    """Writes Markdown sections into ``<stem>.part-NNN.md`` files capped at a byte budget.
+
+    Sections are never split: before each one starts, its size is estimated from
+    the member's uncompressed size (decoded UTF-8 never grows past it), and a new
+    part is opened if the section would overflow the current one. A section that
+    is larger than the whole budget gets a part of its own. Sizes are counted as
+    the data streams through. Parts are written with ``newline=''``, so the
+    counted UTF-8 bytes are exactly the bytes on disk on every platform.
+    """
+
+    def __init__(self, output_md_path, max_bytes):
+        self.max_bytes = max_bytes
+        self.directory = os.path.dirname(output_md_path)
+        self.stem = Path(output_md_path).stem
+        self.parts = []
+        self.file_parts = {}
+        self._file = None
+        self._written = 0
+
+    def part_name(self, number):
+        return f"{self.stem}.part-{number:03d}.md"
+
+    def _open_next_part(self):
+        self._close_part()
+        name = self.part_name(len(self.parts) + 1)
+        self._file = open(os.path.join(self.directory, name), 'w', encoding='utf-8', newline='', buffering=8192)
+        self._written = 0
+        self.parts.append({'file': name, 'bytes': 0, 'files': []})
+
+    def _close_part(self):
+        if self._file is not None:
+            self._file.close()
+            self.parts[-1]['bytes'] = self._written
+            self._file = None
+
+    def start_section(self, file_path, estimated_size):
+        """Roll over to a new part if a section of ``estimated_size`` bytes would not fit."""
+        if self._file is None or (self._written and self._written + estimated_size > self.max_bytes):
+            self._open_next_part()
+        self.parts[-1]['files'].append(file_path)
+        self.file_parts[file_path] = self.parts[-1]['file']
+
+    def write(self, text):
+        if self._file is None:
+            self._open_next_part()
+        self._file.write(text)
+        self._written += len(text.encode('utf-8'))
+
+    def close(self):
+        """Close the last part, remove stale parts from earlier runs and write the manifest."""
+        self._close_part()
+        number = len(self.parts) + 1
+        while os.path.exists(os.path.join(self.directory, self.part_name(number))):
+            os.remove(os.path.join(self.directory, self.part_name(number)))
+            number += 1
+
+        manifest = {'max_bytes': self.max_bytes, 'parts': self.parts, 'files': self.file_parts}
+        with open(os.path.join(self.directory, f"{self.stem}.manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _section_size_estimate(info):
+    """Upper bound on the bytes a member's section occupies in the Markdown output.
+
+    It assumes the shortest fence; members with their own backtick-only lines
+    get a longer one and may overshoot by a few bytes.
+    """
+    language = get_language_from_extension(info.filename)
+    overhead = len(f"## {info.filename}\n```{language}\n\n```\n\n".encode('utf-8'))
+    return info.file_size + overhead
+
+def process_zip_to_markdown(zip_path, output_md_path, show_progress=True, stats=None, cache_dir=None,
+                            use_mmap=False, max_part_bytes=None, progress_callback=None, cancel_event=None,
+                            ignore=None):
+    """Process a ZIP file and combine text-based files into a single Markdown file.
+
+    If a ``stats`` dict is given it is filled with the number of files written
+    and, when ``cache_dir`` is set, the cache hit/miss counts. With ``use_mmap``
+    the archive is memory-mapped and members are read from the mapped view.
+    With ``max_part_bytes`` the output is split into ``<stem>.part-NNN.md``
+    files of at most that size plus a ``<stem>.manifest.json``.
+
+    ``progress_callback(files_done, files_total, bytes_done)`` is called after
+    every member, and setting ``cancel_event`` (a ``threading.Event``) stops
+    the conversion before the next member. ``ignore`` is an IgnoreConfig; by
+    default ``.gitignore``/``.extractignore`` files inside the archive apply.
+    """
+    mapped = None
+    try:
+        with open(zip_path, 'rb') as raw_file:
+            if use_mmap and os.fstat(raw_file.fileno()).st_size > 0:
+                mapped = mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            with zipfile.ZipFile(raw_file, 'r') as zip_ref:
+                open_member = _member_opener(zip_ref, mapped)
+                # Get list of all files in the ZIP, filter ignored and non-text files upfront
+                members = [info for info in sorted(zip_ref.infolist(), key=lambda i: i.filename) if not info.is_dir()]
+                keep = build_path_filter(ignore, [info.filename for info in members],
+                                         lambda name: zip_ref.read(name).decode('utf-8', errors='ignore'))
+                file_list = [info for info in members if keep(info.filename) and is_text_member(open_member, info)]
+                return write_markdown_members(
+                    file_list, open_member, output_md_path, show_progress=show_progress, stats=stats,
+                    cache_dir=cache_dir, max_part_bytes=max_part_bytes,
+                    progress_callback=progress_callback, cancel_event=cancel_event)
     except Exception as e:
         return False, f"Error processing ZIP file: {str(e)}"
+    finally:
+        if mapped is not None:
+            mapped.close()
+
+def write_markdown_members(file_list, open_member, output_md_path, show_progress=True, stats=None, cache_dir=None,
+                           max_part_bytes=None, progress_callback=None, cancel_event=None):
+    """Write the sections for ``file_list`` (already filtered and ordered) to the Markdown output.
+
+    Each entry needs ``filename`` and ``file_size`` (and ``CRC`` when caching);
+    ``open_member(entry)`` must return a readable binary file object. Options
+    are those of process_zip_to_markdown.
+    """
+    hits = misses = 0
+    bytes_done = 0
+    cancelled = False
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    # Use a buffered writer to reduce I/O overhead
+    if max_part_bytes:
+        output = PartedMarkdownWriter(output_md_path, max_part_bytes)
+    else:
+        # newline='' writes members' line endings untranslated (CRLF content would become \r\r\n on Windows)
+        output = open(output_md_path, 'w', encoding='utf-8', newline='', buffering=8192)
+    with output as md_file:
+        # Progress bar for large file counts
+        for done, info in enumerate(tqdm(file_list, desc="Processing files", unit="file",
+                                         disable=not show_progress), start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            file_path = info.filename
+            if max_part_bytes:
+                md_file.start_section(file_path, _section_size_estimate(info))
+            try:
+                if cache_dir:
+                    if write_cached_section(open_member, info, md_file, cache_dir):
+                        hits += 1
+                    else:
+                        misses += 1
+                else:
+                    write_markdown_section(lambda: open_member(info), file_path, md_file)
+                    
+            except Exception as e:
+                # Log error and continue with next file
+                md_file.write(f"## {file_path}\n")
+                md_file.write(f"**Error**: Could not process file: {str(e)}\n\n")
+
+            bytes_done += info.file_size
+            if progress_callback is not None:
+                progress_callback(done, len(file_list), bytes_done)
+
+    if stats is not None:
+        stats['files'] = len(file_list)
+        stats['cache_hits'] = hits
+        stats['cache_misses'] = misses
+        if max_part_bytes:
+            stats['parts'] = len(output.parts)
+
+    if cancelled:
+        return False, "Conversion cancelled; the output is incomplete."
+    if max_part_bytes and not output.parts:
+        return True, "No files matched; no Markdown parts were written."
+    if max_part_bytes:
+        return True, (f"Markdown split into {len(output.parts)} part(s): "
+                      f"{os.path.join(output.directory, output.part_name(1))} ...")
+    return True, f"Markdown file generated successfully: {output_md_path}"
+
+SKIPPED_DIRECTORIES = frozenset({'.git', '.hg', '.svn'})  # VCS metadata is never part of a project bundle
+
+class DirectoryEntry:
+    """A file found while scanning a directory tree, shaped like the ``ZipInfo`` fields we use."""
+
+    __slots__ = ('filename', 'path', 'file_size')
+
+    def __init__(self, filename, path, file_size):
+        self.filename = filename
+        self.path = path
+        self.file_size = file_size
+
+def scan_directory(root_dir):
+    """Recursively list files under ``root_dir`` with ``os.scandir``, sorted like ZIP member names."""
+    entries = []
+    pending = [(root_dir, '')]
+    while pending:
+        directory, prefix = pending.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRECTORIES:
+                        pending.append((entry.path, f"{prefix}{entry.name}/"))
+                elif entry.is_file():
+                    entries.append(DirectoryEntry(f"{prefix}{entry.name}", entry.path, entry.stat().st_size))
+    entries.sort(key=lambda e: e.filename)
+    return entries
+
+class PrefetchingReader:
+    """Reads files on a thread pool ahead of the (sequential) Markdown writer.
+
+    Entries must be opened in the order they were given. Only files of at most
+    ``max_bytes`` are read ahead, and at most ``window`` of them are held in
+    memory at once; larger files are opened from disk when their turn comes and
+    streamed in chunks by the writer.
+    """
+
+    def __init__(self, entries, executor, window, max_bytes=PREFETCH_MAX_BYTES):
+        self._entries = iter(entries)
+        self._executor = executor
+        self._window = window
+        self._max_bytes = max_bytes
+        self._futures = {}
+        for _ in range(window):
+            self._submit_next()
+
+    def _submit_next(self):
+        entry = next(self._entries, None)
+        if entry is not None:
+            if entry.file_size > self._max_bytes:
+                self._futures[entry.filename] = None
+            else:
+                self._futures[entry.filename] = self._executor.submit(self._read, entry.path)
+
+    @staticmethod
+    def _read(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def open(self, entry):
+        if entry.filename not in self._futures:
+            return _open_directory_file(entry)  # Opened again for a second pass
+        future = self._futures.pop(entry.filename)
+        self._submit_next()
+        if future is None:
+            return _open_directory_file(entry)
+        return io.BytesIO(future.result())
+
+def _open_directory_file(entry):
+    return open(entry.path, 'rb')
+
+def process_directory_to_markdown(dir_path, output_md_path, show_progress=True, stats=None, max_part_bytes=None,
+                                  progress_callback=None, cancel_event=None, workers=8, ignore=None):
+    """Combine the text files of a directory tree into Markdown without zipping it first.
+
+    The tree is walked with ``os.scandir``, filtered and ordered exactly like
+    ZIP members, and files are read ahead in parallel by ``workers`` threads.
+    Other options are those of process_zip_to_markdown.
+    """
+    try:
+        entries = scan_directory(dir_path)
+        paths = {entry.filename: entry.path for entry in entries}
+
+        def read_text(name):
+            with open(paths[name], 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read()
+
+        keep = build_path_filter(ignore, list(paths), read_text)
+        file_list = [entry for entry in entries
+                     if keep(entry.filename) and is_text_member(_open_directory_file, entry)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            reader = PrefetchingReader(file_list, executor, window=workers * 2)
+            return write_markdown_members(
+                file_list, reader.open, output_md_path, show_progress=show_progress, stats=stats,
+                max_part_bytes=max_part_bytes, progress_callback=progress_callback, cancel_event=cancel_event)
+    except Exception as e:
+        return False, f"Error processing directory: {str(e)}"
+
+def directory_option_warning(cache_dir=None, use_mmap=False):
+    """Describe the ZIP-only options that a directory input ignores, or return None."""
+    ignored = [option for option, given in (('--cache', cache_dir), ('--mmap', use_mmap)) if given]
+    if not ignored:
+        return None
+    return f"Warning: ignoring {' and '.join(ignored)} for directory input (ZIP archives only)."
+
+def expand_archive_patterns(patterns):
+    """Expand file names and glob patterns into a sorted, de-duplicated list of ZIP paths."""
+    archives = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if any(c in pattern for c in '*?[') else [pattern]
+        for match in matches:
+            key = os.path.abspath(match)
+            if key not in seen:
+                seen.add(key)
+                archives.append(match)
+    return archives
+
+BATCH_INDEX_STEM = 'index'  # --index writes <output>/index.md
+
+def _batch_output_names(archives, output_folder, reserved=()):
+    """Map each archive to ``<output>/<stem>.md``, suffixing stems that collide with each other or ``reserved``."""
+    names = {}
+    used = set(reserved)
+    for zip_path in archives:
+        stem = Path(zip_path).stem
+        candidate = stem
+        counter = 2
+        while candidate in used:
+            candidate = f"{stem}-{counter}"
+            counter += 1
+        used.add(candidate)
+        names[zip_path] = os.path.join(output_folder, f"{candidate}.md")
+    return names
+
+def _convert_archive(zip_path, output_md_path, cache_dir=None, use_mmap=False, max_part_bytes=None, ignore=None):
+    """Worker entry point for batch mode: convert one archive and time it."""
+    stats = {'files': 0, 'cache_hits': 0, 'cache_misses': 0}
+    start = time.perf_counter()
+    if not os.path.exists(zip_path):
+        success, message = False, f"Error: ZIP file '{zip_path}' does not exist."
+    elif os.path.isdir(zip_path):
+        success, message = process_directory_to_markdown(
+            zip_path, output_md_path, show_progress=False, stats=stats, max_part_bytes=max_part_bytes, ignore=ignore)
+    else:
+        success, message = process_zip_to_markdown(
+            zip_path, output_md_path, show_progress=False, stats=stats, cache_dir=cache_dir, use_mmap=use_mmap,
+            max_part_bytes=max_part_bytes, ignore=ignore)
+    if max_part_bytes:
+        # Split output is described by its manifest rather than a single Markdown file
+        output_md_path = os.path.join(os.path.dirname(output_md_path), f"{Path(output_md_path).stem}.manifest.json")
+    return {
+        'archive': zip_path,
+        'output': output_md_path,
+        'success': success,
+        'message': message,
+        'files': stats['files'],
+        'cache_hits': stats['cache_hits'],
+        'cache_misses': stats['cache_misses'],
+        'seconds': time.perf_counter() - start,
+    }
+
+def write_batch_index(results, index_path):
+    """Write a combined Markdown index linking every generated per-archive file."""
+    index_dir = os.path.dirname(os.path.abspath(index_path))
+    with open(index_path, 'w', encoding='utf-8') as index_file:
+        index_file.write("# Archive Index\n\n")
+        index_file.write("| Archive | Markdown | Files | Time (s) | Status |\n")
+        index_file.write("|---|---|---|---|---|\n")
+        for result in results:
+            link = os.path.relpath(os.path.abspath(result['output']), index_dir).replace(os.sep, '/')
+            status = "ok" if result['success'] else "failed"
+            index_file.write(
+                f"| {os.path.basename(result['archive'])} | [{os.path.basename(link)}]({link}) "
+                f"| {result['files']} | {result['seconds']:.2f} | {status} |\n"
+            )
+
+def process_archives_batch(patterns, output_folder, workers=None, index=False, cache_dir=None, use_mmap=False,
+                           max_part_bytes=None, ignore=None):
+    """Convert many ZIP files in parallel, one Markdown file per archive.
+
+    Archives are spread across a process pool; results are returned in input
+    order together with per-archive timing. With ``index``, an input whose
+    stem is ``index`` is written as ``index-2.md`` so the combined index
+    cannot overwrite it.
+    """
+    archives = expand_archive_patterns(patterns)
+    if not archives:
+        return []
+
+    os.makedirs(output_folder, exist_ok=True)
+    # An archive called index.zip must not be overwritten by the combined index
+    output_names = _batch_output_names(archives, output_folder, reserved=[BATCH_INDEX_STEM] if index else [])
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_convert_archive, zip_path, output_names[zip_path], cache_dir, use_mmap,
+                            max_part_bytes, ignore): zip_path
+            for zip_path in archives
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Processing archives", unit="zip"):
+            zip_path = futures[future]
+            try:
+                results[zip_path] = future.result()
+            except Exception as e:
+                results[zip_path] = {
+                    'archive': zip_path,
+                    'output': output_names[zip_path],
+                    'success': False,
+                    'message': f"Error processing ZIP file: {str(e)}",
+                    'files': 0,
+                    'cache_hits': 0,
+                    'cache_misses': 0,
+                    'seconds': 0.0,
+                }
+
+    ordered = [results[zip_path] for zip_path in archives]
+    if index:
+        write_batch_index(ordered, os.path.join(output_folder, f"{BATCH_INDEX_STEM}.md"))
+    return ordered
+
+def print_batch_summary(results, elapsed, cache_stats=False):
+    """Print per-archive timing and totals for a batch run."""
+    width = max(len(os.path.basename(r['archive'])) for r in results)
+    for result in results:
+        name = os.path.basename(result['archive']).ljust(width)
+        if result['success']:
+            line = f"{name}  {result['files']:6d} files  {result['seconds']:8.2f}s  -> {result['output']}"
+            if cache_stats:
+                line += f"  (cache: {result['cache_hits']} hits, {result['cache_misses']} misses)"
+            print(line)
+        else:
+            print(f"{name}  FAILED  {result['message']}")
+    ok = sum(1 for r in results if r['success'])
+    print(f"Converted {ok}/{len(results)} archives in {elapsed:.2f}s")
 
 class ZipToMarkdownApp:
+    POLL_INTERVAL_MS = 100  # How often the Tk loop drains the worker's progress queue
+
     def __init__(self, root):
         self.root = root
         self.root.title("ZIP to Markdown Converter")
@@ -95,6 +921,12 @@ class ZipToMarkdownApp:
         # Default output folder
         self.default_output_folder = os.path.join(os.getcwd(), "requirement")
         self.output_folder = self.default_output_folder
+
+        # Background conversion state
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.events = queue.Queue()
+        self.started_at = None
         
         # Create GUI elements
         self.create_widgets()
@@ -112,8 +944,17 @@ class ZipToMarkdownApp:
         self.folder_label.pack()
         tk.Button(self.root, text="Choose Folder", command=self.choose_folder).pack(pady=5)
         
-        # Generate button
-        tk.Button(self.root, text="Generate Markdown", command=self.generate_markdown).pack(pady=10)
+        # Generate and cancel buttons
+        self.generate_button = tk.Button(self.root, text="Generate Markdown", command=self.generate_markdown)
+        self.generate_button.pack(pady=10)
+        self.cancel_button = tk.Button(self.root, text="Cancel", command=self.cancel_conversion, state=tk.DISABLED)
+        self.cancel_button.pack()
+
+        # Live progress
+        self.progress_bar = ttk.Progressbar(self.root, length=320, mode='determinate')
+        self.progress_bar.pack(padx=10, pady=5)
+        self.progress_label = tk.Label(self.root, text="")
+        self.progress_label.pack(pady=(0, 10))
         
     def browse_zip(self):
         self.zip_path = filedialog.askopenfilename(filetypes=[("ZIP files", "*.zip")])
@@ -133,35 +974,136 @@ class ZipToMarkdownApp:
         if not self.zip_path:
             messagebox.showerror("Error", "Please select a ZIP file.")
             return
+        if self.worker is not None and self.worker.is_alive():
+            return
         
         # Ensure output folder exists
         os.makedirs(self.output_folder, exist_ok=True)
         output_md_path = os.path.join(self.output_folder, "all_files.md")
         
         # Disable generate button during processing
-        self.root.config(cursor="wait")
-        self.root.update()
+        self.generate_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_bar.config(value=0, maximum=1)
+        self.progress_label.config(text="Starting...")
+        self.cancel_event.clear()
+        self.started_at = time.perf_counter()
         
-        # Process the ZIP file
-        success, message = process_zip_to_markdown(self.zip_path, output_md_path)
-        
-        # Re-enable cursor
-        self.root.config(cursor="")
+        # Process the ZIP file on a worker thread; Tk widgets are only touched from poll_events
+        self.worker = threading.Thread(
+            target=self.run_conversion, args=(self.zip_path, output_md_path), daemon=True)
+        self.worker.start()
+        self.root.after(self.POLL_INTERVAL_MS, self.poll_events)
+
+    def run_conversion(self, zip_path, output_md_path):
+        """Worker thread body: convert the archive and report through the event queue."""
+        def report(done, total, bytes_done):
+            self.events.put(('progress', done, total, bytes_done))
+
+        success, message = process_zip_to_markdown(
+            zip_path, output_md_path, show_progress=False,
+            progress_callback=report, cancel_event=self.cancel_event)
+        self.events.put(('done', success, message))
+
+    def cancel_conversion(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text="Cancelling...")
+
+    def poll_events(self):
+        """Drain the worker's event queue on the Tk thread and reschedule until it finishes."""
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event[0] == 'progress':
+                _, done, total, bytes_done = event
+                elapsed = max(time.perf_counter() - self.started_at, 1e-6)
+                self.progress_bar.config(maximum=max(total, 1), value=done)
+                self.progress_label.config(
+                    text=f"{done}/{total} files, {bytes_done / 1e6:.1f} MB, {bytes_done / 1e6 / elapsed:.1f} MB/s")
+            else:
+                _, success, message = event
+                self.finish_conversion(success, message)
+                return
+
+        self.root.after(self.POLL_INTERVAL_MS, self.poll_events)
+
+    def finish_conversion(self, success, message):
+        self.generate_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text=message)
         
         if success:
             messagebox.showinfo("Success", message)
+        elif self.cancel_event.is_set():
+            messagebox.showwarning("Cancelled", message)
         else:
             messagebox.showerror("Error", message)
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Combine the text files of a ZIP archive or directory into Markdown.")
+    parser.add_argument('zip_path', nargs='?', help="ZIP file or directory to convert (omit to start the GUI)")
+    parser.add_argument('output_folder', nargs='?', default="requirement", help="Output folder (default: requirement)")
+    parser.add_argument('--batch', nargs='+', metavar='ZIP_OR_GLOB',
+                        help="Convert many archives (or directories) in parallel, one Markdown file each")
+    parser.add_argument('-o', '--output', help="Output folder for batch mode (defaults to output_folder)")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument('--index', action='store_true', help="Also write a combined index.md in batch mode")
+    parser.add_argument('--cache', metavar='DIR',
+                        help="Reuse rendered sections for members whose CRC32 and size are unchanged")
+    parser.add_argument('--cache-stats', action='store_true', help="Report cache hit/miss counts")
+    parser.add_argument('--mmap', action='store_true', help="Read archives through a memory map")
+    parser.add_argument('--threads', type=int, default=8, help="Reader threads for directory input (default: 8)")
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help="Leave out paths matching a gitignore-style glob (repeatable)")
+    parser.add_argument('--include', action='append', default=[], metavar='GLOB',
+                        help="Only keep paths matching a gitignore-style glob (repeatable)")
+    parser.add_argument('--ignore-file', action='append', default=[], metavar='PATH',
+                        help="Extra .gitignore-style pattern file applied at the input root (repeatable)")
+    parser.add_argument('--no-ignore-files', action='store_true',
+                        help="Do not honour .gitignore/.extractignore files inside the input")
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument('--max-part-bytes', type=int, metavar='N',
+                        help="Split output into <stem>.part-NNN.md files of at most N bytes")
+    budget.add_argument('--max-part-tokens', type=int, metavar='N',
+                        help=f"Like --max-part-bytes, assuming {BYTES_PER_TOKEN} bytes per token")
+    args = parser.parse_args(argv)
+    args.max_part_bytes = args.max_part_bytes or (args.max_part_tokens and args.max_part_tokens * BYTES_PER_TOKEN)
+    args.ignore = IgnoreConfig(exclude=args.exclude, include=args.include, ignore_files=args.ignore_file,
+                               use_tree_ignore_files=not args.no_ignore_files)
+    return args
+
 def main():
+    """Run the CLI (or the GUI without arguments); returns the process exit status."""
     # Check if running in CLI mode
     if len(sys.argv) > 1:
-        zip_path = sys.argv[1]
-        output_folder = "requirement"
-        
-        # Check for optional output folder argument
-        if len(sys.argv) > 2:
-            output_folder = sys.argv[2]
+        args = parse_args(sys.argv[1:])
+
+        if args.batch:
+            patterns = args.batch + ([args.zip_path] if args.zip_path else [])
+            output_folder = args.output or args.output_folder
+            warning = directory_option_warning(args.cache, args.mmap)
+            if warning and any(os.path.isdir(path) for path in expand_archive_patterns(patterns)):
+                print(warning)
+            start = time.perf_counter()
+            results = process_archives_batch(
+                patterns, output_folder, workers=args.jobs, index=args.index, cache_dir=args.cache,
+                use_mmap=args.mmap, max_part_bytes=args.max_part_bytes, ignore=args.ignore)
+            if not results:
+                print("Error: no ZIP files matched.")
+                return 1
+            print_batch_summary(results, time.perf_counter() - start, cache_stats=args.cache_stats)
+            return 0 if all(result['success'] for result in results) else 1
+
+        if not args.zip_path:
+            print("Error: a ZIP file is required.")
+            return 1
+
+        zip_path = args.zip_path
+        output_folder = args.output or args.output_folder
             
         # Ensure output folder exists
         os.makedirs(output_folder, exist_ok=True)
@@ -170,16 +1112,31 @@ def main():
         # Validate ZIP file
         if not os.path.exists(zip_path):
             print(f"Error: ZIP file '{zip_path}' does not exist.")
-            return
+            return 1
             
-        # Process ZIP file with progress feedback
-        success, message = process_zip_to_markdown(zip_path, output_md_path)
+        # Process ZIP file (or directory tree) with progress feedback
+        stats = {}
+        if os.path.isdir(zip_path):
+            warning = directory_option_warning(args.cache, args.mmap)
+            if warning:
+                print(warning)
+            success, message = process_directory_to_markdown(
+                zip_path, output_md_path, stats=stats, max_part_bytes=args.max_part_bytes, workers=args.threads,
+                ignore=args.ignore)
+        else:
+            success, message = process_zip_to_markdown(
+                zip_path, output_md_path, stats=stats, cache_dir=args.cache, use_mmap=args.mmap,
+                max_part_bytes=args.max_part_bytes, ignore=args.ignore)
         print(message)
+        if success and args.cache_stats:
+            print(f"Cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses")
+        return 0 if success else 1
     else:
         # Run GUI mode
         root = tk.Tk()
         app = ZipToMarkdownApp(root)
         root.mainloop()
+        return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
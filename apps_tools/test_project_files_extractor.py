@@ -0,0 +1,204 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import project_files_extractor_with_zip as extractor
+
+from markdown_to_project import BundleError, BundleParser, rebuild_project
+from project_files_extractor_with_zip import (CHUNK_SIZE, SCAN_KEEP_BYTES, IgnoreConfig, build_path_filter,
+                                              process_archives_batch, process_zip_to_markdown,
+                                              write_markdown_section)
+
+
+def keep_paths(names, ignore_text, **config):
+    """Return the names kept when ``ignore_text`` is the root ``.gitignore``."""
+    names = ['.gitignore'] + names
+    keep = build_path_filter(IgnoreConfig(**config), names, lambda name: ignore_text)
+    return [name for name in names[1:] if keep(name)]
+
+
+class PathFilterTest(unittest.TestCase):
+    def test_negation_re_includes_a_file(self):
+        self.assertEqual(
+            keep_paths(['a.sql', 'keep.sql', 'main.go'], "*.sql\n!keep.sql\n"),
+            ['keep.sql', 'main.go'])
+
+    def test_negation_cannot_re_include_under_an_excluded_directory(self):
+        self.assertEqual(
+            keep_paths(['data/keep.sql', 'data/x.sql', 'main.go'], "data/\n!data/keep.sql\n"),
+            ['main.go'])
+
+    def test_nested_directory_under_an_excluded_directory(self):
+        self.assertEqual(
+            keep_paths(['build/out/keep.txt', 'src/a.py'], "build\n!build/out/\n!build/out/keep.txt\n"),
+            ['src/a.py'])
+
+    def test_negation_works_when_only_directory_contents_are_excluded(self):
+        self.assertEqual(
+            keep_paths(['data/keep.sql', 'data/x.sql'], "data/**\n!data/keep.sql\n"),
+            ['data/keep.sql'])
+
+    def test_negation_works_when_directory_children_are_excluded(self):
+        self.assertEqual(
+            keep_paths(['data/keep.sql', 'data/x.sql', 'main.go'], "data/*\n!data/keep.sql\n"),
+            ['data/keep.sql', 'main.go'])
+
+    def test_negated_directory_under_a_children_glob(self):
+        self.assertEqual(
+            keep_paths(['logs/a.log', 'logs/keep/b.log', 'logs/other/c.log'], "logs/*\n!logs/keep/\n"),
+            ['logs/keep/b.log'])
+
+    def test_directory_only_rule_does_not_match_a_file(self):
+        self.assertEqual(
+            keep_paths(['build', 'src/build/x.o', 'main.go'], "build/\n"),
+            ['build', 'main.go'])
+
+    def test_re_included_directories_allow_re_included_files(self):
+        self.assertEqual(
+            keep_paths(['src/a.py', 'src/b.txt', 'notes.txt'], "*\n!*/\n!*.py\n"),
+            ['src/a.py'])
+
+    def test_exclude_glob_overrides_tree_rules(self):
+        self.assertEqual(
+            keep_paths(['a.py', 'b.py'], "!b.py\n", exclude=['*.py']),
+            [])
+
+
+def windows_open(file, mode='r', *args, **kwargs):
+    """open() as on Windows: text written without ``newline=''`` gets CRLF line endings."""
+    if 'b' not in mode and 'newline' not in kwargs and len(args) < 4:
+        kwargs['newline'] = '\r\n'
+    return open(file, mode, *args, **kwargs)
+
+
+def bundle(files):
+    """Render ``{path: text}`` as the extractor does."""
+    md_file = io.StringIO()
+    for path, text in files.items():
+        data = text.encode('utf-8')
+        write_markdown_section(lambda: io.BytesIO(data), path, md_file)
+    return md_file.getvalue()
+
+
+def parse(markdown):
+    return {path: ''.join(body) for path, body in BundleParser(io.StringIO(markdown)).sections()}
+
+
+class BundleRoundTripTest(unittest.TestCase):
+    def test_fence_lines_in_contents_survive(self):
+        files = {
+            'README.md': "# Demo\n\n```go\nfunc main() {}\n```\n\n## not/a/file.txt\n````\n",
+            'docs/all_files.md': "## a.py\n```python\nprint(1)\n```\n\n",
+            'main.go': "package main\n",
+        }
+        markdown = bundle(files)
+        self.assertIn("`````markdown\n", markdown)
+        self.assertEqual(parse(markdown), files)
+
+    def test_fence_line_split_across_chunks(self):
+        text = 'x' * (CHUNK_SIZE - 2) + "\n" + "``````" + "\n"
+        markdown = bundle({'notes.txt': text})
+        self.assertTrue(markdown.startswith("## notes.txt\n```````text\n"))
+        self.assertEqual(parse(markdown), {'notes.txt': text})
+
+    def test_missing_final_newline_survives(self):
+        files = {'a.env': "KEY=value", 'b.go': "package b\r", 'c.txt': "", 'd.md': "```"}
+        markdown = bundle(files)
+        self.assertIn("## a.env\n```bash no-final-newline\nKEY=value\n```\n", markdown)
+        self.assertEqual(parse(markdown), files)
+
+    def test_large_member_is_read_twice_and_survives(self):
+        text = ('x' * 1000 + "\n") * (SCAN_KEEP_BYTES // 1000) + "`````\nend"
+        opened = []
+
+        def open_file():
+            opened.append(1)
+            return io.BytesIO(text.encode('utf-8'))
+
+        md_file = io.StringIO()
+        self.assertTrue(write_markdown_section(open_file, 'big.txt', md_file))
+        self.assertEqual(len(opened), 2)
+        self.assertEqual(parse(md_file.getvalue()), {'big.txt': text})
+
+    def test_zip_round_trip_with_cache(self):
+        files = {'go.mod': "module demo\n", 'main.go': "package main", 'README.md': "```go\n```"}
+        with tempfile.TemporaryDirectory() as tmp:
+            zip_path = os.path.join(tmp, 'in.zip')
+            with zipfile.ZipFile(zip_path, 'w') as zipf:
+                for path, text in files.items():
+                    zipf.writestr(path, text)
+            for run in range(2):  # A cache miss, then a hit
+                md_path = os.path.join(tmp, f'out{run}.md')
+                success, message = process_zip_to_markdown(zip_path, md_path, show_progress=False,
+                                                           cache_dir=os.path.join(tmp, 'cache'))
+                self.assertTrue(success, message)
+                out_dir = os.path.join(tmp, f'rebuilt{run}')
+                rebuild_project([md_path], out_dir)
+                for path, text in files.items():
+                    with open(os.path.join(out_dir, path), 'r', encoding='utf-8', newline='') as f:
+                        self.assertEqual(f.read(), text)
+
+    def test_parts_stay_within_budget_and_keep_crlf(self):
+        files = {f'f{i}.txt': "line\r\n" * 40 for i in range(10)}
+        with tempfile.TemporaryDirectory() as tmp:
+            zip_path = os.path.join(tmp, 'in.zip')
+            with zipfile.ZipFile(zip_path, 'w') as zipf:
+                for path, text in files.items():
+                    zipf.writestr(path, text)
+            md_path = os.path.join(tmp, 'out.md')
+            with mock.patch.object(extractor, 'open', windows_open, create=True):
+                success, message = process_zip_to_markdown(zip_path, md_path, show_progress=False,
+                                                           max_part_bytes=1000)
+            self.assertTrue(success, message)
+            with open(os.path.join(tmp, 'out.manifest.json'), encoding='utf-8') as f:
+                parts = json.load(f)['parts']
+            self.assertGreater(len(parts), 1)
+            for part in parts:
+                self.assertEqual(os.path.getsize(os.path.join(tmp, part['file'])), part['bytes'])
+                self.assertLessEqual(part['bytes'], 1000)
+            out_dir = os.path.join(tmp, 'rebuilt')
+            rebuild_project([os.path.join(tmp, 'out.manifest.json')], out_dir)
+            for path, text in files.items():
+                with open(os.path.join(out_dir, path), 'rb') as f:
+                    self.assertEqual(f.read(), text.encode('utf-8'))
+
+    def test_text_after_a_closing_fence_is_ambiguous(self):
+        markdown = "## a.md\n```markdown\nbefore\n```\n\nafter\n```\n\n"
+        with self.assertRaises(BundleError):
+            parse(markdown)
+
+
+class BatchTest(unittest.TestCase):
+    def test_index_does_not_overwrite_an_archive_named_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            zip_path = os.path.join(tmp, 'index.zip')
+            with zipfile.ZipFile(zip_path, 'w') as zipf:
+                zipf.writestr('main.go', "package main\n")
+            out_dir = os.path.join(tmp, 'out')
+            results = process_archives_batch([zip_path], out_dir, workers=1, index=True)
+            self.assertEqual(results[0]['output'], os.path.join(out_dir, 'index-2.md'))
+            with open(results[0]['output'], encoding='utf-8') as f:
+                self.assertIn("## main.go\n", f.read())
+            with open(os.path.join(out_dir, 'index.md'), encoding='utf-8') as f:
+                self.assertIn("[index-2.md](index-2.md)", f.read())
+
+    def test_batch_exit_status_reports_failures(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            good = os.path.join(tmp, 'good.zip')
+            with zipfile.ZipFile(good, 'w') as zipf:
+                zipf.writestr('main.go', "package main\n")
+            bad = os.path.join(tmp, 'bad.zip')
+            with open(bad, 'wb') as f:
+                f.write(b'not a zip')
+            for inputs, status in (([good], 0), ([good, bad], 1)):
+                argv = ['extractor', '--batch', *inputs, '-o', os.path.join(tmp, 'out'), '-j', '1']
+                with mock.patch('sys.argv', argv), mock.patch('sys.stdout', io.StringIO()):
+                    self.assertEqual(extractor.main(), status)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,55 +1,77 @@
 package main
 
 import (
-    "flag"
-    "fmt"
-    "log"
-    "os"
-
-    "csv-json-sanitizer/internal/domain"
-    "csv-json-sanitizer/internal/repository"
-    "csv-json-sanitizer/internal/usecase"
-    "gopkg.in/yaml.v3"
+	"flag"
+	"fmt"
+	"log"
+	"os"
+	"runtime"
+
+	"csv-json-sanitizer/internal/domain"
+	"csv-json-sanitizer/internal/repository"
+	"csv-json-sanitizer/internal/usecase"
+	"gopkg.in/yaml.v3"
 )
 
 func main() {
-    input := flag.String("input", "", "Input file path (CSV/JSON)")
-    output := flag.String("output", "", "Output file path (CSV/JSON)")
-    rulesFile := flag.String("rules", "", "Optional rules YAML file")
-    flag.Parse()
-
-    if *input == "" || *output == "" {
-        log.Fatal("Input and output flags required")
-    }
-
-    handler := repository.NewFileHandler()
-    rows, err := handler.ReadFile(*input)
-    if err != nil {
-        log.Fatalf("Read error: %v", err)
-    }
-
-    // Load rules if provided
-    var rules []domain.SanitizationRule
-    if *rulesFile != "" {
-        data, err := os.ReadFile(*rulesFile)
-        if err != nil {
-            log.Fatalf("Rules load error: %v", err)
-        }
-        yaml.Unmarshal(data, &rules)
-    } else {
-        // Default rules
-        rules = []domain.SanitizationRule{
-            {Field: "email", Required: true, Validator: "email"},
-            {Field: "name", Default: "Unknown"},
-        }
-    }
-
-    service := usecase.NewSanitizeService()
-    cleanedRows, result := service.Sanitize(rows, rules)
-
-    fmt.Printf("Sanitization complete: Processed %d, Errors %d, Duplicates %d\n", result.Processed, result.Errors, result.Duplicates)
-
-    if err := handler.WriteFile(*output, cleanedRows, result); err != nil {
-        log.Fatalf("Write error: %v", err)
-    }
-}
\ No newline at end of file
+	input := flag.String("input", "", "Input file path (CSV, JSON array or NDJSON)")
+	output := flag.String("output", "", "Output file path (CSV, JSON or NDJSON)")
+	rulesFile := flag.String("rules", "", "Optional rules YAML file")
+	workers := flag.Int("workers", runtime.NumCPU(), "Goroutines cleaning rows in parallel (1 = sequential)")
+	dedupMemory := flag.Int("dedup-memory", 0, "Find duplicates on disk using at most this many MiB (0 = in-memory set)")
+	bloom := flag.Bool("bloom", true, "With -dedup-memory, skip the sort for rows a Bloom filter proves unique")
+	flag.Parse()
+
+	if *input == "" || *output == "" {
+		log.Fatal("Input and output flags required")
+	}
+	// Rows are written while the input is still being read
+	if inInfo, err := os.Stat(*input); err == nil {
+		if outInfo, err := os.Stat(*output); err == nil && os.SameFile(inInfo, outInfo) {
+			log.Fatal("Input and output must be different files")
+		}
+	}
+
+	handler := repository.NewFileHandler()
+	reader, err := handler.OpenReader(*input)
+	if err != nil {
+		log.Fatalf("Read error: %v", err)
+	}
+	defer reader.Close()
+
+	// Load rules if provided
+	var rules []domain.SanitizationRule
+	if *rulesFile != "" {
+		data, err := os.ReadFile(*rulesFile)
+		if err != nil {
+			log.Fatalf("Rules load error: %v", err)
+		}
+		yaml.Unmarshal(data, &rules)
+	} else {
+		// Default rules
+		rules = []domain.SanitizationRule{
+			{Field: "email", Required: true, Validator: "email"},
+			{Field: "name", Default: "Unknown"},
+		}
+	}
+
+	writer, err := handler.CreateWriter(*output, reader.Schema())
+	if err != nil {
+		log.Fatalf("Write error: %v", err)
+	}
+
+	service := usecase.NewSanitizeService(usecase.Config{
+		Workers:     *workers,
+		DedupMemory: *dedupMemory << 20,
+		Bloom:       *bloom,
+	})
+	result, err := service.Sanitize(reader, writer, rules)
+	if err != nil {
+		log.Fatalf("Sanitize error: %v", err)
+	}
+	if err := writer.Close(result); err != nil {
+		log.Fatalf("Write error: %v", err)
+	}
+
+	fmt.Printf("Sanitization complete: Processed %d, Errors %d, Duplicates %d\n", result.Processed, result.Errors, result.Duplicates)
+}
@@ -1,9 +1,92 @@
 package domain
 
-import "time"
+import (
+	"sync"
+	"time"
+)
 
-// Row represents a single data row from CSV or JSON.
-type Row map[string]interface{}
+// Kind is the type of a Value, as read from the input.
+type Kind uint8
+
+const (
+	KindMissing Kind = iota // The row has no such field
+	KindString
+	KindNumber // Str holds the number exactly as written
+	KindBool   // Str is "true" or "false"
+	KindNull
+	KindRaw // A nested JSON object or array; Str holds its compact JSON text
+)
+
+// Value is one typed cell. Str is its text as rules and CSV output see it
+// (empty for null). The zero Value is missing.
+type Value struct {
+	Kind Kind
+	Str  string
+}
+
+func String(s string) Value { return Value{Kind: KindString, Str: s} }
+
+// Row is a single data row from CSV or JSON: its values indexed by column
+// position in the reader's Schema. Columns past the end of a row are missing.
+type Row []Value
+
+// Get returns the value in column i, or a missing Value.
+func (r Row) Get(i int) Value {
+	if i < len(r) {
+		return r[i]
+	}
+	return Value{}
+}
+
+// Set stores v in column i, growing the row if needed.
+func (r *Row) Set(i int, v Value) {
+	for len(*r) <= i {
+		*r = append(*r, Value{})
+	}
+	(*r)[i] = v
+}
+
+// Schema interns column names so each is stored once and rows can refer to
+// columns by index. JSON readers add columns as new keys appear; indexes never
+// change once assigned. It is safe for concurrent use.
+type Schema struct {
+	mu    sync.RWMutex
+	names []string
+	index map[string]int
+}
+
+func NewSchema(names ...string) *Schema {
+	s := &Schema{index: make(map[string]int, len(names))}
+	for _, name := range names {
+		s.Add(name)
+	}
+	return s
+}
+
+// Add returns the index of name, assigning the next one if it is new.
+func (s *Schema) Add(name string) int {
+	s.mu.RLock()
+	i, ok := s.index[name]
+	s.mu.RUnlock()
+	if ok {
+		return i
+	}
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	if i, ok := s.index[name]; ok {
+		return i
+	}
+	s.names = append(s.names, name)
+	s.index[name] = len(s.names) - 1
+	return len(s.names) - 1
+}
+
+// Columns returns a copy of the column names, in index order.
+func (s *Schema) Columns() []string {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+	return append([]string(nil), s.names...)
+}
 
 // SanitizationRule defines configurable cleaning rules.
 type SanitizationRule struct {
@@ -22,7 +105,23 @@ type SanitizationResult struct {
 	Timestamp  time.Time `json:"timestamp"`
 }
 
+// RowReader yields input rows one at a time, so memory does not grow with
+// the file size. Next returns io.EOF after the last row.
+type RowReader interface {
+	Next() (Row, error)
+	// Schema names the columns of the rows returned so far.
+	Schema() *Schema
+	Close() error
+}
+
+// RowWriter receives cleaned rows as they are produced. Close writes any
+// trailer (the JSON result block) and flushes the output.
+type RowWriter interface {
+	Write(Row) error
+	Close(SanitizationResult) error
+}
+
 // SanitizerPort defines the interface for sanitization logic.
 type SanitizerPort interface {
-	Sanitize([]Row, []SanitizationRule) ([]Row, SanitizationResult)
+	Sanitize(RowReader, RowWriter, []SanitizationRule) (SanitizationResult, error)
 }
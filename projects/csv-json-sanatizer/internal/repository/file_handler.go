@@ -1,126 +1,541 @@
 package repository
 
 import (
-    "encoding/csv"
-    "encoding/json"
-    "fmt"
-    "io"
-    "os"
-    "path/filepath"
-    "strings"
-
-    "csv-json-sanitizer/internal/domain"
+	"bufio"
+	"bytes"
+	"encoding/csv"
+	"encoding/json"
+	"io"
+	"os"
+	"path/filepath"
+	"sort"
+	"strings"
+	"unicode/utf8"
+
+	"csv-json-sanitizer/internal/domain"
+)
+
+const bufferSize = 1 << 20 // Read/write buffer per file
+
+// Format is a file encoding, chosen by extension.
+type Format int
+
+const (
+	FormatCSV    Format = iota // Header row, then one record per row
+	FormatJSON                 // Input: an array of objects. Output: {"data": [...], "result": {...}}
+	FormatNDJSON               // One JSON object per line (.ndjson or .jsonl)
 )
 
+// FormatOf picks the format for path from its extension.
+func FormatOf(path string) (Format, error) {
+	switch strings.ToLower(filepath.Ext(path)) {
+	case ".csv":
+		return FormatCSV, nil
+	case ".json":
+		return FormatJSON, nil
+	case ".ndjson", ".jsonl":
+		return FormatNDJSON, nil
+	}
+	return 0, domain.ErrInvalidFile
+}
+
 type FileHandler struct{}
 
 func NewFileHandler() *FileHandler {
-    return &FileHandler{}
-}
-
-// ReadFile reads CSV or JSON into rows.
-func (h *FileHandler) ReadFile(path string) ([]domain.Row, error) {
-    ext := strings.ToLower(filepath.Ext(path))
-    file, err := os.Open(path)
-    if err != nil {
-        return nil, err
-    }
-    defer file.Close()
-
-    if ext == ".csv" {
-        return h.readCSV(file)
-    } else if ext == ".json" {
-        return h.readJSON(file)
-    }
-    return nil, domain.ErrInvalidFile
-}
-
-func (h *FileHandler) readCSV(r io.Reader) ([]domain.Row, error) {
-    reader := csv.NewReader(r)
-    records, err := reader.ReadAll()
-    if err != nil {
-        return nil, err
-    }
-
-    if len(records) == 0 {
-        return []domain.Row{}, nil
-    }
-
-    headers := records[0]
-    rows := make([]domain.Row, 0, len(records)-1)
-    for _, record := range records[1:] {
-        row := make(domain.Row)
-        for i, val := range record {
-            if i < len(headers) {
-                row[headers[i]] = strings.TrimSpace(val)
-            }
-        }
-        rows = append(rows, row)
-    }
-    return rows, nil
-}
-
-func (h *FileHandler) readJSON(r io.Reader) ([]domain.Row, error) {
-    var data []domain.Row
-    if err := json.NewDecoder(r).Decode(&data); err != nil {
-        return nil, err
-    }
-    return data, nil
-}
-
-// WriteFile writes rows to CSV or JSON.
-func (h *FileHandler) WriteFile(path string, rows []domain.Row, result domain.SanitizationResult) error {
-    file, err := os.Create(path)
-    if err != nil {
-        return err
-    }
-    defer file.Close()
-
-    ext := strings.ToLower(filepath.Ext(path))
-    if ext == ".csv" {
-        return h.writeCSV(file, rows)
-    } else if ext == ".json" {
-        return h.writeJSON(file, rows, result)
-    }
-    return domain.ErrInvalidFile
-}
-
-func (h *FileHandler) writeCSV(w io.Writer, rows []domain.Row) error {
-    writer := csv.NewWriter(w)
-    defer writer.Flush()
-
-    // Assume rows have consistent keys; get headers from first row
-    if len(rows) == 0 {
-        return nil
-    }
-
-    headers := make([]string, 0)
-    for k := range rows[0] {
-        headers = append(headers, k)
-    }
-    if err := writer.Write(headers); err != nil {
-        return err
-    }
-
-    for _, row := range rows {
-        record := make([]string, len(headers))
-        for i, h := range headers {
-            if val, ok := row[h]; ok {
-                record[i] = fmt.Sprintf("%v", val)
-            }
-        }
-        if err := writer.Write(record); err != nil {
-            return err
-        }
-    }
-    return nil
-}
-
-func (h *FileHandler) writeJSON(w io.Writer, rows []domain.Row, result domain.SanitizationResult) error {
-    output := struct {
-        Data   []domain.Row          `json:"data"`
-        Result domain.SanitizationResult `json:"result"`
-    }{rows, result}
-
-    return json.NewEncoder(w).Encode(output)
-}
\ No newline at end of file
+	return &FileHandler{}
+}
+
+// OpenReader opens a CSV, JSON or NDJSON file for row-at-a-time reading.
+func (h *FileHandler) OpenReader(path string) (domain.RowReader, error) {
+	format, err := FormatOf(path)
+	if err != nil {
+		return nil, err
+	}
+	file, err := os.Open(path)
+	if err != nil {
+		return nil, err
+	}
+
+	buffered := bufio.NewReaderSize(file, bufferSize)
+	var reader domain.RowReader
+	switch format {
+	case FormatCSV:
+		reader, err = newCSVReader(buffered, file)
+	case FormatJSON:
+		reader, err = newJSONArrayReader(buffered, file)
+	default:
+		reader = newNDJSONReader(buffered, file)
+	}
+	if err != nil {
+		file.Close()
+		return nil, err
+	}
+	return reader, nil
+}
+
+type csvReader struct {
+	reader  *csv.Reader
+	schema  *domain.Schema
+	columns []int // Schema index of each record position; repeated headers share one
+	width   int   // Distinct headers
+	closer  io.Closer
+}
+
+func newCSVReader(r io.Reader, closer io.Closer) (*csvReader, error) {
+	reader := csv.NewReader(r)
+	reader.ReuseRecord = true // Values are copied into each row, so the record buffer can be reused
+	headers, err := reader.Read()
+	if err == io.EOF {
+		return &csvReader{reader: reader, schema: domain.NewSchema(), closer: closer}, nil // Empty file: no rows
+	}
+	if err != nil {
+		return nil, err
+	}
+	schema := domain.NewSchema()
+	columns := make([]int, len(headers))
+	for i, header := range headers {
+		columns[i] = schema.Add(header)
+	}
+	return &csvReader{reader: reader, schema: schema, columns: columns, width: len(schema.Columns()), closer: closer}, nil
+}
+
+func (c *csvReader) Next() (domain.Row, error) {
+	if c.width == 0 {
+		return nil, io.EOF
+	}
+	record, err := c.reader.Read()
+	if err != nil {
+		return nil, err
+	}
+	row := make(domain.Row, c.width)
+	for i, val := range record {
+		if i < len(c.columns) {
+			row[c.columns[i]] = domain.String(strings.TrimSpace(val)) // A repeated header's last value wins
+		}
+	}
+	return row, nil
+}
+
+func (c *csvReader) Schema() *domain.Schema { return c.schema }
+func (c *csvReader) Close() error           { return c.closer.Close() }
+
+// objectDecoder reads JSON objects as typed rows, interning their keys in
+// schema. Scalars keep their JSON type; nested objects and arrays are kept
+// as compact JSON text.
+//
+// Each object is decoded whole (which validates it) and converted to a
+// single string; the row's values are substrings of it, as with csv.Reader,
+// so a row costs a couple of allocations however many fields it has.
+type objectDecoder struct {
+	decoder *json.Decoder
+	schema  *domain.Schema
+	columns map[string]int // Schema indexes of the keys seen so far
+	cells   []cell
+	raw     json.RawMessage
+	compact bytes.Buffer
+}
+
+type cell struct {
+	column int
+	value  domain.Value
+}
+
+func newObjectDecoder(r io.Reader) *objectDecoder {
+	return &objectDecoder{decoder: json.NewDecoder(r), schema: domain.NewSchema(), columns: make(map[string]int)}
+}
+
+// next decodes one object, or returns an empty row for null.
+func (o *objectDecoder) next() (domain.Row, error) {
+	if err := o.decoder.Decode(&o.raw); err != nil {
+		return nil, err
+	}
+	text := string(o.raw)
+	if text == "null" {
+		return domain.Row{}, nil
+	}
+	if text[0] != '{' {
+		return nil, domain.ErrInvalidFile
+	}
+
+	o.cells = o.cells[:0]
+	width := 0
+	for pos := skipSpace(text, 1); text[pos] != '}'; {
+		end := endOfString(text, pos)
+		column, err := o.column(text[pos:end])
+		if err != nil {
+			return nil, err
+		}
+		pos = skipSpace(text, skipSpace(text, end)+1) // Past the ':'
+		end = endOfValue(text, pos)
+		value, err := o.value(text[pos:end])
+		if err != nil {
+			return nil, err
+		}
+		o.cells = append(o.cells, cell{column: column, value: value})
+		width = max(width, column+1)
+		if pos = skipSpace(text, end); text[pos] == ',' {
+			pos = skipSpace(text, pos+1)
+		}
+	}
+
+	row := make(domain.Row, width)
+	for _, c := range o.cells {
+		row[c.column] = c.value // A repeated key keeps its last value
+	}
+	return row, nil
+}
+
+// column returns the schema index for a quoted key.
+func (o *objectDecoder) column(quoted string) (int, error) {
+	if column, ok := o.columns[quoted]; ok {
+		return column, nil
+	}
+	var name string
+	if err := json.Unmarshal([]byte(quoted), &name); err != nil {
+		return 0, err
+	}
+	column := o.schema.Add(name)
+	o.columns[strings.Clone(quoted)] = column // Not a slice of the row text, which would stay alive
+	return column, nil
+}
+
+func (o *objectDecoder) value(raw string) (domain.Value, error) {
+	switch raw[0] {
+	case '"':
+		if strings.IndexByte(raw, '\\') < 0 && utf8.ValidString(raw) {
+			return domain.String(raw[1 : len(raw)-1]), nil // Nothing to unescape
+		}
+		var s string
+		if err := json.Unmarshal([]byte(raw), &s); err != nil {
+			return domain.Value{}, err
+		}
+		return domain.String(s), nil
+	case 't', 'f':
+		return domain.Value{Kind: domain.KindBool, Str: raw}, nil
+	case 'n':
+		return domain.Value{Kind: domain.KindNull}, nil
+	case '{', '[':
+		o.compact.Reset()
+		if err := json.Compact(&o.compact, []byte(raw)); err != nil {
+			return domain.Value{}, err
+		}
+		return domain.Value{Kind: domain.KindRaw, Str: o.compact.String()}, nil
+	}
+	return domain.Value{Kind: domain.KindNumber, Str: raw}, nil
+}
+
+// The scanners below walk JSON text the decoder has already validated, so
+// they only need to find where each token ends.
+
+func skipSpace(s string, i int) int {
+	for s[i] == ' ' || s[i] == '\t' || s[i] == '\n' || s[i] == '\r' {
+		i++
+	}
+	return i
+}
+
+// endOfString returns the index just past the string starting at s[i].
+func endOfString(s string, i int) int {
+	for i++; s[i] != '"'; i++ {
+		if s[i] == '\\' {
+			i++
+		}
+	}
+	return i + 1
+}
+
+// endOfValue returns the index just past the value starting at s[i].
+func endOfValue(s string, i int) int {
+	switch s[i] {
+	case '"':
+		return endOfString(s, i)
+	case '{', '[':
+		for depth := 0; ; {
+			switch s[i] {
+			case '"':
+				i = endOfString(s, i)
+				continue
+			case '{', '[':
+				depth++
+			case '}', ']':
+				if depth--; depth == 0 {
+					return i + 1
+				}
+			}
+			i++
+		}
+	}
+	for i < len(s) && !strings.ContainsRune(",}] \t\n\r", rune(s[i])) {
+		i++
+	}
+	return i
+}
+
+// jsonArrayReader decodes one array element at a time with the streaming
+// token API instead of unmarshalling the whole array.
+type jsonArrayReader struct {
+	*objectDecoder
+	closer io.Closer
+	done   bool
+}
+
+func newJSONArrayReader(r io.Reader, closer io.Closer) (*jsonArrayReader, error) {
+	objects := newObjectDecoder(r)
+	token, err := objects.decoder.Token()
+	if err != nil {
+		return nil, err
+	}
+	if delim, ok := token.(json.Delim); !ok || delim != '[' {
+		return nil, domain.ErrInvalidFile
+	}
+	return &jsonArrayReader{objectDecoder: objects, closer: closer}, nil
+}
+
+func (j *jsonArrayReader) Next() (domain.Row, error) {
+	if j.done {
+		return nil, io.EOF
+	}
+	if !j.decoder.More() {
+		j.done = true
+		if _, err := j.decoder.Token(); err != nil { // Closing ']'
+			return nil, err
+		}
+		return nil, io.EOF
+	}
+	return j.next()
+}
+
+func (j *jsonArrayReader) Schema() *domain.Schema { return j.schema }
+func (j *jsonArrayReader) Close() error           { return j.closer.Close() }
+
+type ndjsonReader struct {
+	*objectDecoder
+	closer io.Closer
+}
+
+func newNDJSONReader(r io.Reader, closer io.Closer) *ndjsonReader {
+	return &ndjsonReader{objectDecoder: newObjectDecoder(r), closer: closer}
+}
+
+func (n *ndjsonReader) Next() (domain.Row, error) {
+	return n.next() // io.EOF after the last line
+}
+
+func (n *ndjsonReader) Schema() *domain.Schema { return n.schema }
+func (n *ndjsonReader) Close() error           { return n.closer.Close() }
+
+// CreateWriter creates path and returns a streaming writer for its format,
+// naming columns from schema. CSV output has one column for each field of
+// the first row, in schema order; JSON objects list their fields by name.
+func (h *FileHandler) CreateWriter(path string, schema *domain.Schema) (domain.RowWriter, error) {
+	format, err := FormatOf(path)
+	if err != nil {
+		return nil, err
+	}
+	file, err := os.Create(path)
+	if err != nil {
+		return nil, err
+	}
+
+	out := fileOutput{file: file, buf: bufio.NewWriterSize(file, bufferSize)}
+	switch format {
+	case FormatCSV:
+		return &csvWriter{fileOutput: out, writer: csv.NewWriter(out.buf), schema: schema}, nil
+	case FormatJSON:
+		return &jsonWriter{fileOutput: out, rowEncoder: rowEncoder{schema: schema}}, nil
+	default:
+		return &ndjsonWriter{fileOutput: out, rowEncoder: rowEncoder{schema: schema}}, nil
+	}
+}
+
+type fileOutput struct {
+	file *os.File
+	buf  *bufio.Writer
+}
+
+func (o fileOutput) close() error {
+	err := o.buf.Flush()
+	if closeErr := o.file.Close(); err == nil {
+		err = closeErr
+	}
+	return err
+}
+
+type csvWriter struct {
+	fileOutput
+	writer  *csv.Writer
+	schema  *domain.Schema
+	columns []int // Schema index of each output column, fixed by the first row
+	record  []string
+}
+
+func (c *csvWriter) Write(row domain.Row) error {
+	if c.record == nil {
+		names := c.schema.Columns()
+		var headers []string
+		for i, val := range row {
+			if val.Kind != domain.KindMissing {
+				c.columns = append(c.columns, i)
+				headers = append(headers, names[i])
+			}
+		}
+		if err := c.writer.Write(headers); err != nil {
+			return err
+		}
+		c.record = make([]string, len(c.columns))
+	}
+	for i, column := range c.columns {
+		c.record[i] = row.Get(column).Str
+	}
+	return c.writer.Write(c.record)
+}
+
+func (c *csvWriter) Close(domain.SanitizationResult) error {
+	c.writer.Flush()
+	if err := c.writer.Error(); err != nil {
+		c.close()
+		return err
+	}
+	return c.close()
+}
+
+// rowEncoder writes rows as JSON objects with their fields sorted by name.
+type rowEncoder struct {
+	schema *domain.Schema
+	names  []string
+	order  []int // Column indexes sorted by name
+	data   []byte
+}
+
+func (e *rowEncoder) encode(row domain.Row) []byte {
+	if len(row) > len(e.names) { // The input has gained columns since the last row
+		e.names = e.schema.Columns()
+		e.order = e.order[:0]
+		for i := range e.names {
+			e.order = append(e.order, i)
+		}
+		sort.Slice(e.order, func(a, b int) bool { return e.names[e.order[a]] < e.names[e.order[b]] })
+	}
+
+	buf := append(e.data[:0], '{')
+	for _, i := range e.order {
+		val := row.Get(i)
+		if val.Kind == domain.KindMissing {
+			continue
+		}
+		if len(buf) > 1 {
+			buf = append(buf, ',')
+		}
+		buf = appendJSONString(buf, e.names[i])
+		buf = append(buf, ':')
+		switch val.Kind {
+		case domain.KindString:
+			buf = appendJSONString(buf, val.Str)
+		case domain.KindNull:
+			buf = append(buf, "null"...)
+		default:
+			buf = append(buf, val.Str...)
+		}
+	}
+	e.data = append(buf, '}')
+	return e.data
+}
+
+// jsonWriter streams the {"data": [...], "result": {...}} document: rows are
+// written as they arrive and the result block once the totals are known.
+type jsonWriter struct {
+	fileOutput
+	rowEncoder
+	count int
+}
+
+func (j *jsonWriter) Write(row domain.Row) error {
+	if j.count == 0 {
+		j.buf.WriteString(`{"data":[`)
+	} else {
+		j.buf.WriteByte(',')
+	}
+	j.count++
+	_, err := j.buf.Write(j.encode(row)) // bufio errors are sticky and surface again in Close
+	return err
+}
+
+func (j *jsonWriter) Close(result domain.SanitizationResult) error {
+	data, err := json.Marshal(result)
+	if err != nil {
+		j.close()
+		return err
+	}
+	if j.count == 0 {
+		j.buf.WriteString(`{"data":[`)
+	}
+	j.buf.WriteString(`],"result":`)
+	j.buf.Write(data)
+	j.buf.WriteString("}\n")
+	return j.close()
+}
+
+type ndjsonWriter struct {
+	fileOutput
+	rowEncoder
+}
+
+func (n *ndjsonWriter) Write(row domain.Row) error {
+	n.buf.Write(n.encode(row))
+	return n.buf.WriteByte('\n')
+}
+
+// Close flushes the output; NDJSON has no place for the result, which main prints.
+func (n *ndjsonWriter) Close(domain.SanitizationResult) error {
+	return n.close()
+}
+
+// appendJSONString appends s as a quoted JSON string, escaped the same way
+// encoding/json does (including <, > and &), without allocating.
+func appendJSONString(buf []byte, s string) []byte {
+	const hex = "0123456789abcdef"
+	buf = append(buf, '"')
+	start := 0
+	for i := 0; i < len(s); {
+		if b := s[i]; b < utf8.RuneSelf {
+			if b >= 0x20 && b != '"' && b != '\\' && b != '<' && b != '>' && b != '&' {
+				i++
+				continue
+			}
+			buf = append(buf, s[start:i]...)
+			switch b {
+			case '"', '\\':
+				buf = append(buf, '\\', b)
+			case '\n':
+				buf = append(buf, '\\', 'n')
+			case '\r':
+				buf = append(buf, '\\', 'r')
+			case '\t':
+				buf = append(buf, '\\', 't')
+			default:
+				buf = append(buf, '\\', 'u', '0', '0', hex[b>>4], hex[b&0xF])
+			}
+			i++
+			start = i
+			continue
+		}
+		r, size := utf8.DecodeRuneInString(s[i:])
+		if r == utf8.RuneError && size == 1 {
+			buf = append(buf, s[start:i]...)
+			buf = append(buf, `\ufffd`...)
+			i += size
+			start = i
+			continue
+		}
+		if r == '\u2028' || r == '\u2029' {
+			buf = append(buf, s[start:i]...)
+			buf = append(buf, '\\', 'u', '2', '0', '2', hex[r&0xF])
+			i += size
+			start = i
+			continue
+		}
+		i += size
+	}
+	buf = append(buf, s[start:]...)
+	return append(buf, '"')
+}
@@ -0,0 +1,71 @@
+package repository
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+
+	"csv-json-sanitizer/internal/domain"
+	"csv-json-sanitizer/internal/usecase"
+)
+
+// convert runs input through the sanitizer with rules, as the command does,
+// and returns the output file's contents.
+func convert(t *testing.T, input, inName, outName string, rules []domain.SanitizationRule) string {
+	t.Helper()
+	dir := t.TempDir()
+	inPath, outPath := filepath.Join(dir, inName), filepath.Join(dir, outName)
+	if err := os.WriteFile(inPath, []byte(input), 0o644); err != nil {
+		t.Fatal(err)
+	}
+	handler := NewFileHandler()
+	reader, err := handler.OpenReader(inPath)
+	if err != nil {
+		t.Fatalf("OpenReader: %v", err)
+	}
+	defer reader.Close()
+	writer, err := handler.CreateWriter(outPath, reader.Schema())
+	if err != nil {
+		t.Fatalf("CreateWriter: %v", err)
+	}
+	result, err := usecase.NewSanitizeService(usecase.Config{}).Sanitize(reader, writer, rules)
+	if err != nil {
+		t.Fatalf("Sanitize: %v", err)
+	}
+	if err := writer.Close(result); err != nil {
+		t.Fatalf("Close: %v", err)
+	}
+	data, err := os.ReadFile(outPath)
+	if err != nil {
+		t.Fatal(err)
+	}
+	return string(data)
+}
+
+func TestCSVDuplicateHeaders(t *testing.T) {
+	got := convert(t, "name,name,age\nA,B,1\nC,D,2\n", "in.csv", "out.csv", nil)
+	want := "name,age\nB,1\nD,2\n" // One column per name; the last value wins
+	if got != want {
+		t.Errorf("output = %q, want %q", got, want)
+	}
+}
+
+func TestCSVDuplicateHeadersToNDJSON(t *testing.T) {
+	got := convert(t, "age,name,age\n1,A,2\n", "in.csv", "out.ndjson", nil)
+	want := `{"age":"2","name":"A"}` + "\n"
+	if got != want {
+		t.Errorf("output = %q, want %q", got, want)
+	}
+}
+
+func TestCSVRuleAddsColumn(t *testing.T) {
+	rules := []domain.SanitizationRule{
+		{Field: "email", Required: true, Validator: "email"},
+		{Field: "country", Required: true, Default: "NA"},
+	}
+	got := convert(t, "name,email,name\nA,a@example.com,B\nC,bad,D\n", "in.csv", "out.csv", rules)
+	want := "name,email,country\nB,a@example.com,NA\nD,,NA\n"
+	if got != want {
+		t.Errorf("output = %q, want %q", got, want)
+	}
+}
@@ -0,0 +1,555 @@
+package usecase
+
+import (
+	"bufio"
+	"bytes"
+	"container/heap"
+	"encoding/binary"
+	"fmt"
+	"io"
+	"math"
+	"os"
+	"path/filepath"
+	"slices"
+
+	"csv-json-sanitizer/internal/domain"
+)
+
+const (
+	dedupPartitions = 16       // Fingerprint runs are split by the top 4 bits
+	runBufferSize   = 64 << 10 // Read/write buffer per spill file
+	recordSize      = 24       // Fingerprint plus big-endian sequence number
+	seqSize         = 8
+	bloomProbes     = 4
+	maxFanIn        = 32 // Runs merged at once, whatever the budget, to stay well inside file descriptor limits
+)
+
+type fpRecord struct {
+	fp  fingerprint
+	seq uint64
+}
+
+// sanitizeExternal removes duplicates without holding a set of every row, for
+// inputs whose distinct rows do not fit in memory. Buffers stay within
+// s.config.DedupMemory bytes and everything else goes to temporary files:
+//
+//  1. Clean each row and spool it, with its fingerprint, to disk. With Bloom
+//     on, a filter of all fingerprints so far marks possible repeats in a
+//     second filter; if nothing repeats, the spool is the output.
+//  2. Re-read the fingerprints. Those that may be repeated (all of them
+//     without Bloom) are sorted by (fingerprint, sequence number) into runs,
+//     partitioned by fingerprint. A k-way merge of each partition's runs sees
+//     every copy of a row together, first occurrence first; the later
+//     sequence numbers are duplicates and are sorted into runs of their own.
+//     Merges read at most mergeFanIn(budget) runs at once; when there are
+//     more, groups of them are first merged into longer runs, pass by pass.
+//  3. Replay the spool in input order, skipping the merged duplicate numbers.
+//
+// The first occurrence of each row is kept, as in the in-memory modes.
+func (s *SanitizeService) sanitizeExternal(in domain.RowReader, out domain.RowWriter, rules []columnRule, result domain.SanitizationResult) (domain.SanitizationResult, error) {
+	dir, err := os.MkdirTemp("", "sanitizer-dedup-")
+	if err != nil {
+		return result, err
+	}
+	defer os.RemoveAll(dir)
+
+	budget := s.config.DedupMemory
+	var seen, repeated *bloomFilter
+	if s.config.Bloom {
+		seen = newBloomFilter(budget / 4)
+		repeated = newBloomFilter(budget / 4)
+		budget /= 2
+	}
+
+	// Pass 1: clean and spool
+	rowsPath := filepath.Join(dir, "rows")
+	fpsPath := filepath.Join(dir, "fingerprints")
+	rows, err := createSpill(rowsPath)
+	if err != nil {
+		return result, err
+	}
+	fps, err := createSpill(fpsPath)
+	if err != nil {
+		rows.close()
+		return result, err
+	}
+	var encoded []byte
+	fp := newFingerprinter()
+	repeats := 0
+	for {
+		row, err := in.Next()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			rows.close()
+			fps.close()
+			return result, err
+		}
+		result.Processed++
+		s.applyRules(&row, rules, &result)
+
+		key := fp.row(row)
+		encoded = appendRow(encoded[:0], row)
+		rows.buf.Write(encoded) // bufio errors are sticky and surface in close
+		fps.buf.Write(key[:])
+		if seen != nil && seen.add(key) {
+			repeated.add(key)
+			repeats++
+		}
+	}
+	if err := rows.close(); err != nil {
+		fps.close()
+		return result, err
+	}
+	if err := fps.close(); err != nil {
+		return result, err
+	}
+
+	// Pass 2: find the duplicate sequence numbers
+	var dups *runMerger
+	if seen == nil || repeats > 0 {
+		runs, err := findDuplicates(dir, fpsPath, repeated, budget)
+		if err != nil {
+			return result, err
+		}
+		if dups, err = openMerger(runs, seqSize); err != nil {
+			return result, err
+		}
+		defer dups.close()
+	}
+
+	// Pass 3: write every row that is not a duplicate
+	nextDup, err := nextSeq(dups)
+	if err != nil {
+		return result, err
+	}
+	file, err := os.Open(rowsPath)
+	if err != nil {
+		return result, err
+	}
+	defer file.Close()
+	reader := bufio.NewReaderSize(file, runBufferSize)
+	for seq := uint64(0); ; seq++ {
+		row, err := readRow(reader, &encoded)
+		if err == io.EOF {
+			break
+		} else if err != nil {
+			return result, err
+		}
+		if seq == nextDup {
+			result.Duplicates++
+			if nextDup, err = nextSeq(dups); err != nil {
+				return result, err
+			}
+			continue
+		}
+		if err := out.Write(row); err != nil {
+			return result, err
+		}
+	}
+	return result, nil
+}
+
+// findDuplicates reads the fingerprint spool and returns sorted run files of
+// the sequence numbers of rows that repeat an earlier one, at most
+// mergeFanIn(budget) of them. Only fingerprints in filter are considered, or
+// all of them when filter is nil.
+func findDuplicates(dir, fpsPath string, filter *bloomFilter, budget int) ([]string, error) {
+	fanIn := mergeFanIn(budget)
+	file, err := os.Open(fpsPath)
+	if err != nil {
+		return nil, err
+	}
+	defer file.Close()
+	reader := bufio.NewReaderSize(file, runBufferSize)
+
+	// Sort candidates into partitioned runs, spilling whenever the buffers fill
+	limit := max(budget/recordSize, 1)
+	var parts [dedupPartitions][]fpRecord
+	var partRuns [dedupPartitions][]string
+	buffered := 0
+	spill := func() error {
+		for p := range parts {
+			if len(parts[p]) == 0 {
+				continue
+			}
+			slices.SortFunc(parts[p], compareRecords)
+			path := filepath.Join(dir, fmt.Sprintf("fp-%02d-%d.run", p, len(partRuns[p])))
+			if err := writeRun(path, func(buf *bufio.Writer) error {
+				var rec [recordSize]byte
+				for _, r := range parts[p] {
+					copy(rec[:], r.fp[:])
+					binary.BigEndian.PutUint64(rec[16:], r.seq)
+					buf.Write(rec[:])
+				}
+				return nil
+			}); err != nil {
+				return err
+			}
+			partRuns[p] = append(partRuns[p], path)
+			parts[p] = parts[p][:0]
+		}
+		buffered = 0
+		return nil
+	}
+	var key fingerprint
+	for seq := uint64(0); ; seq++ {
+		if _, err := io.ReadFull(reader, key[:]); err == io.EOF {
+			break
+		} else if err != nil {
+			return nil, err
+		}
+		if filter != nil && !filter.has(key) {
+			continue // Never seen twice, so neither a duplicate nor the first of one
+		}
+		p := key[0] >> 4
+		parts[p] = append(parts[p], fpRecord{fp: key, seq: seq})
+		if buffered++; buffered >= limit {
+			if err := spill(); err != nil {
+				return nil, err
+			}
+		}
+	}
+	if err := spill(); err != nil {
+		return nil, err
+	}
+	parts = [dedupPartitions][]fpRecord{}
+
+	// Merge each partition; every fingerprint after the first of its group is a duplicate
+	var dupRuns []string
+	dups := make([]uint64, 0, min(max(budget/seqSize, 1), 1<<20))
+	spillDups := func() error {
+		if len(dups) == 0 {
+			return nil
+		}
+		slices.Sort(dups)
+		path := filepath.Join(dir, fmt.Sprintf("dup-%d.run", len(dupRuns)))
+		if err := writeRun(path, func(buf *bufio.Writer) error {
+			var rec [seqSize]byte
+			for _, seq := range dups {
+				binary.BigEndian.PutUint64(rec[:], seq)
+				buf.Write(rec[:])
+			}
+			return nil
+		}); err != nil {
+			return err
+		}
+		dupRuns = append(dupRuns, path)
+		dups = dups[:0]
+		return nil
+	}
+	for p, runs := range partRuns {
+		runs, err := reduceRuns(dir, fmt.Sprintf("fp-%02d", p), runs, recordSize, fanIn)
+		if err != nil {
+			return nil, err
+		}
+		merger, err := openMerger(runs, recordSize)
+		if err != nil {
+			return nil, err
+		}
+		var prev []byte
+		for {
+			rec, err := merger.next()
+			if err == io.EOF {
+				break
+			}
+			if err != nil {
+				merger.close()
+				return nil, err
+			}
+			if prev != nil && bytes.Equal(rec[:16], prev) {
+				dups = append(dups, binary.BigEndian.Uint64(rec[16:]))
+				if len(dups)*seqSize >= budget {
+					if err := spillDups(); err != nil {
+						merger.close()
+						return nil, err
+					}
+				}
+				continue
+			}
+			prev = append(prev[:0], rec[:16]...)
+		}
+		merger.close()
+		for _, path := range runs {
+			os.Remove(path)
+		}
+	}
+	if err := spillDups(); err != nil {
+		return nil, err
+	}
+	return reduceRuns(dir, "dup", dupRuns, seqSize, fanIn)
+}
+
+// mergeFanIn is how many runs one merge may read at once: as many read
+// buffers as fit in budget next to the output's, between 2 and maxFanIn.
+func mergeFanIn(budget int) int {
+	return min(max(budget/runBufferSize-1, 2), maxFanIn)
+}
+
+// reduceRuns merges sorted runs of size-byte records fanIn at a time, pass
+// after pass, until at most fanIn are left, and returns those. Merged runs
+// are deleted; new ones are named after prefix.
+func reduceRuns(dir, prefix string, paths []string, size, fanIn int) ([]string, error) {
+	for pass := 0; len(paths) > fanIn; pass++ {
+		var merged []string
+		for i := 0; i < len(paths); i += fanIn {
+			group := paths[i:min(i+fanIn, len(paths))]
+			if len(group) == 1 {
+				merged = append(merged, group[0])
+				continue
+			}
+			path := filepath.Join(dir, fmt.Sprintf("%s-pass%d-%d.run", prefix, pass, len(merged)))
+			if err := mergeRuns(path, group, size); err != nil {
+				return nil, err
+			}
+			for _, run := range group {
+				os.Remove(run)
+			}
+			merged = append(merged, path)
+		}
+		paths = merged
+	}
+	return paths, nil
+}
+
+// mergeRuns writes the records of the sorted runs at paths to a single sorted run.
+func mergeRuns(path string, paths []string, size int) error {
+	merger, err := openMerger(paths, size)
+	if err != nil {
+		return err
+	}
+	defer merger.close()
+	return writeRun(path, func(buf *bufio.Writer) error {
+		for {
+			rec, err := merger.next()
+			if err == io.EOF {
+				return nil
+			}
+			if err != nil {
+				return err
+			}
+			buf.Write(rec)
+		}
+	})
+}
+
+// appendRow encodes row for the spool: its width, then the kind and
+// length-prefixed text of each cell.
+func appendRow(buf []byte, row domain.Row) []byte {
+	buf = binary.AppendUvarint(buf, uint64(len(row)))
+	for _, val := range row {
+		buf = append(buf, byte(val.Kind))
+		buf = binary.AppendUvarint(buf, uint64(len(val.Str)))
+		buf = append(buf, val.Str...)
+	}
+	return buf
+}
+
+// readRow decodes the next appendRow record, using scratch as its read
+// buffer. It returns io.EOF only at the end of the spool.
+func readRow(r *bufio.Reader, scratch *[]byte) (domain.Row, error) {
+	width, err := binary.ReadUvarint(r)
+	if err != nil {
+		return nil, err
+	}
+	row := make(domain.Row, width)
+	for i := range row {
+		kind, err := r.ReadByte()
+		if err != nil {
+			return nil, io.ErrUnexpectedEOF
+		}
+		size, err := binary.ReadUvarint(r)
+		if err != nil {
+			return nil, io.ErrUnexpectedEOF
+		}
+		if cap(*scratch) < int(size) {
+			*scratch = make([]byte, size)
+		}
+		text := (*scratch)[:size]
+		if _, err := io.ReadFull(r, text); err != nil {
+			return nil, io.ErrUnexpectedEOF
+		}
+		row[i] = domain.Value{Kind: domain.Kind(kind), Str: string(text)}
+	}
+	return row, nil
+}
+
+func compareRecords(a, b fpRecord) int {
+	if c := bytes.Compare(a.fp[:], b.fp[:]); c != 0 {
+		return c
+	}
+	if a.seq < b.seq {
+		return -1
+	}
+	if a.seq > b.seq {
+		return 1
+	}
+	return 0
+}
+
+// nextSeq returns the next duplicate sequence number, or MaxUint64 once there are none.
+func nextSeq(dups *runMerger) (uint64, error) {
+	if dups == nil {
+		return math.MaxUint64, nil
+	}
+	rec, err := dups.next()
+	if err == io.EOF {
+		return math.MaxUint64, nil
+	}
+	if err != nil {
+		return 0, err
+	}
+	return binary.BigEndian.Uint64(rec), nil
+}
+
+type spillFile struct {
+	file *os.File
+	buf  *bufio.Writer
+}
+
+func createSpill(path string) (spillFile, error) {
+	file, err := os.Create(path)
+	if err != nil {
+		return spillFile{}, err
+	}
+	return spillFile{file: file, buf: bufio.NewWriterSize(file, runBufferSize)}, nil
+}
+
+func (s spillFile) close() error {
+	err := s.buf.Flush()
+	if closeErr := s.file.Close(); err == nil {
+		err = closeErr
+	}
+	return err
+}
+
+func writeRun(path string, write func(*bufio.Writer) error) error {
+	run, err := createSpill(path)
+	if err != nil {
+		return err
+	}
+	err = write(run.buf)
+	if closeErr := run.close(); err == nil {
+		err = closeErr
+	}
+	return err
+}
+
+// runMerger is a k-way merge of sorted run files of fixed-size records,
+// yielding them in byte order. It implements heap.Interface over its runs.
+type runMerger struct {
+	size int
+	runs []*runCursor
+	rec  []byte
+}
+
+type runCursor struct {
+	file   *os.File
+	reader *bufio.Reader
+	head   []byte
+}
+
+func openMerger(paths []string, size int) (*runMerger, error) {
+	m := &runMerger{size: size, rec: make([]byte, size)}
+	for _, path := range paths {
+		file, err := os.Open(path)
+		if err != nil {
+			m.close()
+			return nil, err
+		}
+		run := &runCursor{file: file, reader: bufio.NewReaderSize(file, runBufferSize), head: make([]byte, size)}
+		if _, err := io.ReadFull(run.reader, run.head); err != nil {
+			file.Close()
+			if err == io.EOF {
+				continue // Empty run
+			}
+			m.close()
+			return nil, err
+		}
+		m.runs = append(m.runs, run)
+	}
+	heap.Init(m)
+	return m, nil
+}
+
+// next returns the smallest remaining record, valid until the following call,
+// or io.EOF when every run is exhausted.
+func (m *runMerger) next() ([]byte, error) {
+	if len(m.runs) == 0 {
+		return nil, io.EOF
+	}
+	run := m.runs[0]
+	copy(m.rec, run.head)
+	if _, err := io.ReadFull(run.reader, run.head); err == io.EOF {
+		run.file.Close()
+		heap.Pop(m)
+	} else if err != nil {
+		return nil, err
+	} else {
+		heap.Fix(m, 0)
+	}
+	return m.rec, nil
+}
+
+func (m *runMerger) close() {
+	for _, run := range m.runs {
+		run.file.Close()
+	}
+	m.runs = nil
+}
+
+func (m *runMerger) Len() int           { return len(m.runs) }
+func (m *runMerger) Less(i, j int) bool { return bytes.Compare(m.runs[i].head, m.runs[j].head) < 0 }
+func (m *runMerger) Swap(i, j int)      { m.runs[i], m.runs[j] = m.runs[j], m.runs[i] }
+func (m *runMerger) Push(x any)         { m.runs = append(m.runs, x.(*runCursor)) }
+func (m *runMerger) Pop() any {
+	run := m.runs[len(m.runs)-1]
+	m.runs = m.runs[:len(m.runs)-1]
+	return run
+}
+
+// bloomFilter is a fixed-size Bloom filter over fingerprints. They are
+// already uniform hashes, so the probe positions come from their two halves
+// (double hashing) rather than from hashing again.
+type bloomFilter struct {
+	bits []uint64
+	mask uint64
+}
+
+// newBloomFilter sizes the filter to the largest power of two bits that fits in size bytes.
+func newBloomFilter(size int) *bloomFilter {
+	words := 1
+	for words*2*8 <= size {
+		words *= 2
+	}
+	return &bloomFilter{bits: make([]uint64, words), mask: uint64(words*64 - 1)}
+}
+
+// add inserts fp and reports whether it may already have been present.
+func (b *bloomFilter) add(fp fingerprint) bool {
+	h1 := binary.LittleEndian.Uint64(fp[:8])
+	h2 := binary.LittleEndian.Uint64(fp[8:]) | 1
+	present := true
+	for i := uint64(0); i < bloomProbes; i++ {
+		bit := (h1 + i*h2) & b.mask
+		word, mask := &b.bits[bit/64], uint64(1)<<(bit%64)
+		if *word&mask == 0 {
+			present = false
+			*word |= mask
+		}
+	}
+	return present
+}
+
+func (b *bloomFilter) has(fp fingerprint) bool {
+	h1 := binary.LittleEndian.Uint64(fp[:8])
+	h2 := binary.LittleEndian.Uint64(fp[8:]) | 1
+	for i := uint64(0); i < bloomProbes; i++ {
+		bit := (h1 + i*h2) & b.mask
+		if b.bits[bit/64]&(uint64(1)<<(bit%64)) == 0 {
+			return false
+		}
+	}
+	return true
+}
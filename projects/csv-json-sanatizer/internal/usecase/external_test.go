@@ -0,0 +1,118 @@
+package usecase
+
+import (
+	"bufio"
+	"encoding/binary"
+	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"reflect"
+	"slices"
+	"testing"
+
+	"csv-json-sanitizer/internal/domain"
+)
+
+// A budget this small merges two runs at a time, and the partitions get
+// dozens of runs each, so every merge takes several passes.
+const tinyBudget = 4 << 10
+
+func TestExternalMatchesInMemory(t *testing.T) {
+	if mergeFanIn(tinyBudget) != 2 {
+		t.Fatalf("mergeFanIn(%d) = %d, want 2", tinyBudget, mergeFanIn(tinyBudget))
+	}
+	const n = 6000
+	schema, rows := testInput(n)
+	want, wantRows := sequential(t, schema, rows)
+	for _, bloom := range []bool{false, true} {
+		t.Run(fmt.Sprintf("bloom=%v", bloom), func(t *testing.T) {
+			schema, rows := testInput(n)
+			out := &sliceWriter{}
+			got, err := sanitize(t, Config{DedupMemory: tinyBudget, Bloom: bloom}, &sliceReader{schema: schema, rows: rows}, out)
+			if err != nil {
+				t.Fatalf("Sanitize: %v", err)
+			}
+			if got != want {
+				t.Errorf("result = %+v, want %+v", got, want)
+			}
+			if !reflect.DeepEqual(out.rows, wantRows) {
+				t.Errorf("wrote %d rows that differ from the in-memory %d", len(out.rows), len(wantRows))
+			}
+		})
+	}
+}
+
+// With Bloom and a filter big enough for no false positives, nothing is
+// sorted and the spool is replayed as is.
+func TestExternalWithoutRepeats(t *testing.T) {
+	rows := make([]domain.Row, 1000)
+	for i := range rows {
+		rows[i] = domain.Row{domain.String(fmt.Sprint("user ", i)), domain.String(fmt.Sprintf("u%d@example.com", i)), domain.String("1")}
+	}
+	want, wantRows := sequential(t, domain.NewSchema("name", "email", "age"), rows)
+	for _, bloom := range []bool{false, true} {
+		out := &sliceWriter{}
+		in := &sliceReader{schema: domain.NewSchema("name", "email", "age"), rows: rows}
+		got, err := sanitize(t, Config{DedupMemory: 1 << 20, Bloom: bloom}, in, out)
+		if err != nil {
+			t.Fatalf("bloom=%v: Sanitize: %v", bloom, err)
+		}
+		if got != want || !reflect.DeepEqual(out.rows, wantRows) {
+			t.Errorf("bloom=%v: got %+v and %d rows, want %+v and %d", bloom, got, len(out.rows), want, len(wantRows))
+		}
+	}
+}
+
+func TestReduceRuns(t *testing.T) {
+	dir := t.TempDir()
+	var paths []string
+	var all []uint64
+	for r := 0; r < 9; r++ {
+		seqs := []uint64{uint64(r), uint64(r + 20), uint64(r*r + 40)}
+		all = append(all, seqs...)
+		path := filepath.Join(dir, fmt.Sprintf("in-%d.run", r))
+		if err := writeRun(path, func(buf *bufio.Writer) error {
+			var rec [seqSize]byte
+			for _, seq := range seqs {
+				binary.BigEndian.PutUint64(rec[:], seq)
+				buf.Write(rec[:])
+			}
+			return nil
+		}); err != nil {
+			t.Fatal(err)
+		}
+		paths = append(paths, path)
+	}
+
+	runs, err := reduceRuns(dir, "test", paths, seqSize, 2)
+	if err != nil {
+		t.Fatalf("reduceRuns: %v", err)
+	}
+	if len(runs) > 2 {
+		t.Fatalf("reduceRuns left %d runs, want at most 2", len(runs))
+	}
+	merger, err := openMerger(runs, seqSize)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer merger.close()
+	var got []uint64
+	for {
+		rec, err := merger.next()
+		if err == io.EOF {
+			break
+		} else if err != nil {
+			t.Fatal(err)
+		}
+		got = append(got, binary.BigEndian.Uint64(rec))
+	}
+	slices.Sort(all)
+	if !slices.Equal(got, all) {
+		t.Errorf("merged %v, want %v", got, all)
+	}
+	entries, _ := os.ReadDir(dir)
+	if len(entries) != len(runs) {
+		t.Errorf("%d files left in the work directory, want only the %d runs returned", len(entries), len(runs))
+	}
+}
@@ -0,0 +1,50 @@
+package usecase
+
+import (
+	"encoding/binary"
+	"hash"
+	"hash/fnv"
+
+	"csv-json-sanitizer/internal/domain"
+)
+
+// fingerprint identifies a row's content for duplicate detection: a 128-bit
+// FNV-1a hash of its fields. Column indexes come from the reader's schema,
+// where each name has exactly one, so walking the row in index order is
+// already canonical and the duplicate set stores these 16 bytes instead of
+// the row's text.
+type fingerprint [16]byte
+
+// fingerprinter computes row fingerprints, reusing its buffers between rows.
+// It is not safe for concurrent use; each goroutine needs its own.
+type fingerprinter struct {
+	hash hash.Hash
+	buf  []byte
+	sum  []byte
+}
+
+func newFingerprinter() *fingerprinter {
+	return &fingerprinter{hash: fnv.New128a()}
+}
+
+// row hashes each present field as its column index, kind and length-prefixed
+// text, so no two different rows share an encoding. Rows are equal when every
+// column holds the same typed value.
+func (f *fingerprinter) row(row domain.Row) fingerprint {
+	buf := f.buf[:0]
+	for i, val := range row {
+		if val.Kind == domain.KindMissing {
+			continue
+		}
+		buf = binary.AppendUvarint(buf, uint64(i))
+		buf = append(buf, byte(val.Kind))
+		buf = binary.AppendUvarint(buf, uint64(len(val.Str)))
+		buf = append(buf, val.Str...)
+	}
+	f.buf = buf
+
+	f.hash.Reset()
+	f.hash.Write(buf)
+	f.sum = f.hash.Sum(f.sum[:0])
+	return fingerprint(f.sum)
+}
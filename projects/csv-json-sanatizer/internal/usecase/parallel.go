@@ -0,0 +1,176 @@
+package usecase
+
+import (
+	"io"
+	"sync"
+
+	"csv-json-sanitizer/internal/domain"
+)
+
+const (
+	batchSize  = 512 // Rows handed to a worker at a time
+	seenShards = 64  // Lock stripes in the duplicate set; a power of two
+)
+
+// batch is a run of consecutive input rows. first is the sequence number of
+// rows[0], so row i has sequence number first+i.
+type batch struct {
+	seq    int
+	first  int
+	rows   []domain.Row
+	keys   []fingerprint
+	dup    []bool // Already known to repeat an earlier row
+	errors int
+}
+
+// sanitizeParallel fans batches of rows out to s.config.Workers goroutines for rule
+// application and fingerprinting, then writes them back in input order.
+//
+// Workers record every fingerprint in a lock-striped set that keeps the
+// lowest sequence number seen for it. A batch is written only after all
+// earlier batches, by which point every earlier row has been recorded, so a
+// row is the first occurrence exactly when the set still holds its own
+// sequence number. This keeps the same rows as the sequential loop.
+func (s *SanitizeService) sanitizeParallel(in domain.RowReader, out domain.RowWriter, rules []columnRule, result domain.SanitizationResult) (domain.SanitizationResult, error) {
+	seen := newSeenSet()
+	jobs := make(chan *batch, s.config.Workers)
+	results := make(chan *batch, s.config.Workers)
+	tokens := make(chan struct{}, s.config.Workers*4) // Caps the batches in flight so memory stays bounded
+	done := make(chan struct{})                       // Closed when the writer gives up
+
+	var readErr error
+	go func() {
+		defer close(jobs)
+		next := 0
+		for {
+			select {
+			case tokens <- struct{}{}:
+			case <-done:
+				return
+			}
+			b := &batch{seq: next, first: next * batchSize, rows: make([]domain.Row, 0, batchSize)}
+			for len(b.rows) < batchSize {
+				row, err := in.Next()
+				if err != nil {
+					if err != io.EOF {
+						readErr = err
+					}
+					break
+				}
+				b.rows = append(b.rows, row)
+			}
+			if len(b.rows) > 0 {
+				select {
+				case jobs <- b:
+				case <-done:
+					return
+				}
+			}
+			if len(b.rows) < batchSize {
+				return
+			}
+			next++
+		}
+	}()
+
+	var wg sync.WaitGroup
+	for i := 0; i < s.config.Workers; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			fp := newFingerprinter()
+			for b := range jobs {
+				var counts domain.SanitizationResult
+				b.keys = make([]fingerprint, len(b.rows))
+				b.dup = make([]bool, len(b.rows))
+				for i := range b.rows {
+					s.applyRules(&b.rows[i], rules, &counts)
+					b.keys[i] = fp.row(b.rows[i])
+					b.dup[i] = !seen.add(b.keys[i], b.first+i)
+				}
+				b.errors = counts.Errors
+				select {
+				case results <- b:
+				case <-done:
+					return
+				}
+			}
+		}()
+	}
+	go func() {
+		wg.Wait()
+		close(results)
+	}()
+
+	// Reorder batches by sequence number and write them out
+	pending := make(map[int]*batch)
+	next := 0
+	for b := range results {
+		pending[b.seq] = b
+		for b = pending[next]; b != nil; b = pending[next] {
+			delete(pending, next)
+			next++
+			result.Processed += len(b.rows)
+			result.Errors += b.errors
+			for i, row := range b.rows {
+				if b.dup[i] || !seen.isFirst(b.keys[i], b.first+i) {
+					result.Duplicates++
+					continue
+				}
+				if err := out.Write(row); err != nil {
+					close(done)
+					for range results {
+					}
+					return result, err
+				}
+			}
+			<-tokens
+		}
+	}
+	return result, readErr
+}
+
+// seenSet maps row fingerprints to the lowest sequence number they appeared
+// at. It is split into shards, each with its own lock, so workers rarely
+// contend.
+type seenSet struct {
+	shards [seenShards]seenShard
+}
+
+type seenShard struct {
+	mu    sync.Mutex
+	first map[fingerprint]int
+}
+
+func newSeenSet() *seenSet {
+	s := &seenSet{}
+	for i := range s.shards {
+		s.shards[i].first = make(map[fingerprint]int)
+	}
+	return s
+}
+
+func (s *seenSet) shard(key fingerprint) *seenShard {
+	return &s.shards[key[15]&(seenShards-1)] // Fingerprint bits are already well mixed
+}
+
+// add records key at seq and reports whether seq is now its lowest sequence
+// number. false means the row is certainly a duplicate; true still needs
+// isFirst once earlier rows have been added.
+func (s *seenSet) add(key fingerprint, seq int) bool {
+	shard := s.shard(key)
+	shard.mu.Lock()
+	defer shard.mu.Unlock()
+	if first, ok := shard.first[key]; ok && first < seq {
+		return false
+	}
+	shard.first[key] = seq
+	return true
+}
+
+func (s *seenSet) isFirst(key fingerprint, seq int) bool {
+	shard := s.shard(key)
+	shard.mu.Lock()
+	defer shard.mu.Unlock()
+	return shard.first[key] == seq
+}
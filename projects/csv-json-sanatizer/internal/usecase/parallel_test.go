@@ -0,0 +1,183 @@
+package usecase
+
+import (
+	"errors"
+	"fmt"
+	"io"
+	"reflect"
+	"runtime"
+	"testing"
+	"time"
+
+	"csv-json-sanitizer/internal/domain"
+)
+
+// sliceReader serves copies of rows from memory. With err set, Next fails
+// with it once failAt rows have been returned.
+type sliceReader struct {
+	schema *domain.Schema
+	rows   []domain.Row
+	next   int
+	failAt int
+	err    error
+}
+
+func (r *sliceReader) Next() (domain.Row, error) {
+	if r.err != nil && r.next == r.failAt {
+		return nil, r.err
+	}
+	if r.next == len(r.rows) {
+		return nil, io.EOF
+	}
+	row := append(domain.Row(nil), r.rows[r.next]...)
+	r.next++
+	return row, nil
+}
+
+func (r *sliceReader) Schema() *domain.Schema { return r.schema }
+func (r *sliceReader) Close() error           { return nil }
+
+// sliceWriter keeps copies of the rows written. With err set, Write fails
+// with it once failAt rows have been accepted.
+type sliceWriter struct {
+	rows   []domain.Row
+	failAt int
+	err    error
+}
+
+func (w *sliceWriter) Write(row domain.Row) error {
+	if w.err != nil && len(w.rows) == w.failAt {
+		return w.err
+	}
+	w.rows = append(w.rows, append(domain.Row(nil), row...))
+	return nil
+}
+
+func (w *sliceWriter) Close(domain.SanitizationResult) error { return nil }
+
+var testRules = []domain.SanitizationRule{
+	{Field: "name", Required: true},
+	{Field: "email", Required: true, Validator: "email"},
+	{Field: "age", Default: "0"},
+	{Field: "country", Required: true, Default: "NA"}, // Not in the input: adds a column
+}
+
+// testInput returns n rows in which about two in three repeat an earlier
+// row, some emails are invalid and some rows lack trailing columns.
+func testInput(n int) (*domain.Schema, []domain.Row) {
+	schema := domain.NewSchema("name", "email", "age")
+	rows := make([]domain.Row, n)
+	for i := range rows {
+		k := i % (n/3 + 1)
+		email := fmt.Sprintf("user%d@example.com", k)
+		if k%5 == 0 {
+			email = "not-an-email"
+		}
+		row := domain.Row{domain.String(fmt.Sprintf(" user %d ", k)), domain.String(email), domain.String(fmt.Sprint(k % 90))}
+		if k%7 == 0 {
+			row = row[:1]
+		}
+		rows[i] = row
+	}
+	return schema, rows
+}
+
+func sanitize(t *testing.T, config Config, in *sliceReader, out *sliceWriter) (domain.SanitizationResult, error) {
+	t.Helper()
+	result, err := NewSanitizeService(config).Sanitize(in, out, testRules)
+	result.Timestamp = time.Time{}
+	return result, err
+}
+
+func sequential(t *testing.T, schema *domain.Schema, rows []domain.Row) (domain.SanitizationResult, []domain.Row) {
+	t.Helper()
+	out := &sliceWriter{}
+	result, err := sanitize(t, Config{}, &sliceReader{schema: schema, rows: rows}, out)
+	if err != nil {
+		t.Fatalf("sequential run: %v", err)
+	}
+	return result, out.rows
+}
+
+func TestParallelMatchesSequential(t *testing.T) {
+	const n = 5*batchSize + 17 // Several batches and a partial one
+	schema, rows := testInput(n)
+	want, wantRows := sequential(t, schema, rows)
+	if want.Duplicates == 0 || want.Errors == 0 {
+		t.Fatalf("test input has no duplicates or errors: %+v", want)
+	}
+	for _, workers := range []int{2, 3, 8} {
+		t.Run(fmt.Sprintf("workers=%d", workers), func(t *testing.T) {
+			schema, rows := testInput(n)
+			out := &sliceWriter{}
+			got, err := sanitize(t, Config{Workers: workers}, &sliceReader{schema: schema, rows: rows}, out)
+			if err != nil {
+				t.Fatalf("Sanitize: %v", err)
+			}
+			if got != want {
+				t.Errorf("result = %+v, want %+v", got, want)
+			}
+			if !reflect.DeepEqual(out.rows, wantRows) {
+				t.Errorf("wrote %d rows that differ from the sequential %d", len(out.rows), len(wantRows))
+			}
+		})
+	}
+}
+
+func TestParallelEmptyInput(t *testing.T) {
+	out := &sliceWriter{}
+	got, err := sanitize(t, Config{Workers: 4}, &sliceReader{schema: domain.NewSchema("name")}, out)
+	if err != nil {
+		t.Fatalf("Sanitize: %v", err)
+	}
+	if got != (domain.SanitizationResult{}) || len(out.rows) != 0 {
+		t.Errorf("got %+v and %d rows, want nothing", got, len(out.rows))
+	}
+}
+
+func TestParallelReaderError(t *testing.T) {
+	const failAt = 3*batchSize + 100
+	boom := errors.New("read failed")
+	schema, rows := testInput(5 * batchSize)
+	_, wantRows := sequential(t, domain.NewSchema(schema.Columns()...), rows[:failAt])
+	out := &sliceWriter{}
+
+	before := runtime.NumGoroutine()
+	_, err := sanitize(t, Config{Workers: 4}, &sliceReader{schema: schema, rows: rows, failAt: failAt, err: boom}, out)
+	if !errors.Is(err, boom) {
+		t.Fatalf("Sanitize error = %v, want %v", err, boom)
+	}
+	// Every row read before the failure is still written, in order
+	if !reflect.DeepEqual(out.rows, wantRows) {
+		t.Errorf("wrote %d rows, want the %d the sequential path writes", len(out.rows), len(wantRows))
+	}
+	waitForGoroutines(t, before)
+}
+
+func TestParallelWriterError(t *testing.T) {
+	boom := errors.New("write failed")
+	schema, rows := testInput(20 * batchSize)
+	out := &sliceWriter{failAt: 700, err: boom}
+
+	before := runtime.NumGoroutine()
+	_, err := sanitize(t, Config{Workers: 4}, &sliceReader{schema: schema, rows: rows}, out)
+	if !errors.Is(err, boom) {
+		t.Fatalf("Sanitize error = %v, want %v", err, boom)
+	}
+	if len(out.rows) != 700 {
+		t.Errorf("wrote %d rows before failing, want 700", len(out.rows))
+	}
+	waitForGoroutines(t, before)
+}
+
+// waitForGoroutines fails if the reader and worker goroutines outlive Sanitize.
+func waitForGoroutines(t *testing.T, want int) {
+	t.Helper()
+	deadline := time.Now().Add(time.Second)
+	for runtime.NumGoroutine() > want {
+		if time.Now().After(deadline) {
+			t.Fatalf("%d goroutines still running, want %d", runtime.NumGoroutine(), want)
+		}
+		time.Sleep(time.Millisecond)
+	}
+}
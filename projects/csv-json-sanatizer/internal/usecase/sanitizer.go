@@ -1,65 +1,130 @@
 package usecase
 
 import (
-	"fmt"
-	"strings"
+	"io"
 	"time"
 
 	"csv-json-sanitizer/internal/domain"
 	"csv-json-sanitizer/pkg/utils"
 )
 
-type SanitizeService struct{}
+// Config tunes how SanitizeService runs. The zero value cleans rows on the
+// calling goroutine and keeps the duplicate set in memory.
+type Config struct {
+	Workers int // Goroutines cleaning rows; 1 or less is sequential
+	// DedupMemory, when positive, finds duplicates with an external sort
+	// whose buffers stay within this many bytes, instead of an in-memory set.
+	// Rows are then cleaned on one goroutine.
+	DedupMemory int
+	Bloom       bool // With DedupMemory, only sort fingerprints a Bloom filter has seen twice
+}
+
+type SanitizeService struct {
+	config Config
+}
 
-func NewSanitizeService() domain.SanitizerPort {
-	return &SanitizeService{}
+func NewSanitizeService(config Config) domain.SanitizerPort {
+	return &SanitizeService{config: config}
 }
 
-func (s *SanitizeService) Sanitize(rows []domain.Row, rules []domain.SanitizationRule) ([]domain.Row, domain.SanitizationResult) {
+// Sanitize streams rows from in to out, cleaning each one as it is read, so
+// only the current row (plus the duplicate set) is held in memory.
+func (s *SanitizeService) Sanitize(in domain.RowReader, out domain.RowWriter, rules []domain.SanitizationRule) (domain.SanitizationResult, error) {
 	result := domain.SanitizationResult{
-		Processed: len(rows),
 		Timestamp: time.Now(),
 	}
 
-	cleaned := make([]domain.Row, 0, len(rows))
-	seen := make(map[string]bool) // For duplicate detection via key hash
-
-	for _, row := range rows {
-		// Apply rules
-		for _, rule := range rules {
-			if val, exists := row[rule.Field]; exists {
-				cleanedVal := utils.CleanValue(fmt.Sprintf("%v", val), rule)
-				row[rule.Field] = cleanedVal
-
-				if rule.Required && cleanedVal == "" {
-					result.Errors++
-					continue // Skip invalid rows
-				}
-				row[rule.Field] = cleanedVal
-			} else if rule.Required {
-				row[rule.Field] = rule.Default
-				result.Errors++
-			}
+	// Bind rules to column indexes after the first row, so that a JSON
+	// input's own fields come before rule-only fields in the schema
+	first, err := in.Next()
+	if err != nil && err != io.EOF {
+		return result, err
+	}
+	columns := compileRules(in.Schema(), rules)
+	if err == nil {
+		in = &peekedReader{RowReader: in, first: first}
+	}
+
+	if s.config.DedupMemory > 0 {
+		return s.sanitizeExternal(in, out, columns, result)
+	}
+	if s.config.Workers > 1 {
+		return s.sanitizeParallel(in, out, columns, result)
+	}
+
+	seen := make(map[fingerprint]struct{}) // Rows already written, by content hash
+	fp := newFingerprinter()
+
+	for {
+		row, err := in.Next()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			return result, err
 		}
+		result.Processed++
+
+		s.applyRules(&row, columns, &result)
 
-		// Check duplicates (simple hash of all fields)
-		key := s.rowKey(row)
-		if seen[key] {
+		// Check duplicates
+		key := fp.row(row)
+		if _, ok := seen[key]; ok {
 			result.Duplicates++
 			continue
 		}
-		seen[key] = true
+		seen[key] = struct{}{}
 
-		cleaned = append(cleaned, row)
+		if err := out.Write(row); err != nil {
+			return result, err
+		}
+	}
+
+	return result, nil
+}
+
+// columnRule is a rule bound to the schema index of its field, so applying
+// it is a slice lookup rather than a search by name.
+type columnRule struct {
+	domain.SanitizationRule
+	column int
+}
+
+func compileRules(schema *domain.Schema, rules []domain.SanitizationRule) []columnRule {
+	columns := make([]columnRule, len(rules))
+	for i, rule := range rules {
+		columns[i] = columnRule{SanitizationRule: rule, column: schema.Add(rule.Field)}
 	}
+	return columns
+}
+
+// applyRules cleans the fields named by rules in place, counting errors in
+// result. Cleaned values become strings whatever their input type.
+func (s *SanitizeService) applyRules(row *domain.Row, rules []columnRule, result *domain.SanitizationResult) {
+	for _, rule := range rules {
+		if val := row.Get(rule.column); val.Kind != domain.KindMissing {
+			cleanedVal := utils.CleanValue(val.Str, rule.SanitizationRule)
+			row.Set(rule.column, domain.String(cleanedVal)) // Invalid required values are blanked too
+			if rule.Required && cleanedVal == "" {
+				result.Errors++
+			}
+		} else if rule.Required {
+			row.Set(rule.column, domain.String(rule.Default))
+			result.Errors++
+		}
+	}
+}
 
-	return cleaned, result
+// peekedReader returns first ahead of the rest of the wrapped reader's rows.
+type peekedReader struct {
+	domain.RowReader
+	first domain.Row
 }
 
-func (s *SanitizeService) rowKey(row domain.Row) string {
-	var keys []string
-	for k := range row {
-		keys = append(keys, fmt.Sprintf("%s:%v", k, row[k]))
+func (p *peekedReader) Next() (domain.Row, error) {
+	if row := p.first; row != nil {
+		p.first = nil
+		return row, nil
 	}
-	return strings.Join(keys, "|")
+	return p.RowReader.Next()
 }
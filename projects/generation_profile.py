@@ -0,0 +1,80 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Opt-in timing for the generators. Code paths open named phases ("render",
+# "mkdir", "write", "compress", "zip") and add file and byte counts to the
+# phase record; repeated phases accumulate. Pass profile=None (the default
+# everywhere) and phase() hands out a throwaway record instead.
+
+def _new_record():
+    return {'calls': 0, 'seconds': 0.0, 'files': 0, 'bytes_in': 0, 'bytes_out': 0}
+
+class GenerationProfile:
+    """Per-phase wall time, file counts and bytes for one generator run."""
+
+    def __init__(self):
+        self.phases = {}  # name -> record, in first-use order
+        self._start = time.perf_counter()
+
+    def record(self, name):
+        return self.phases.setdefault(name, _new_record())
+
+    @contextmanager
+    def phase(self, name):
+        record = self.record(name)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] += time.perf_counter() - start
+            record['calls'] += 1
+
+    def to_dict(self):
+        phases = {}
+        for name, record in self.phases.items():
+            phases[name] = dict(record)
+            if record['bytes_in'] and record['bytes_out']:
+                phases[name]['ratio'] = round(record['bytes_out'] / record['bytes_in'], 4)
+        return {'total_seconds': time.perf_counter() - self._start, 'phases': phases}
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+    def format_table(self) -> str:
+        report = self.to_dict()
+        lines = [f"{'phase':<10} {'calls':>6} {'seconds':>9} {'files':>6} {'bytes in':>11} {'bytes out':>11} {'ratio':>6}"]
+        for name, record in report['phases'].items():
+            ratio = f"{record['ratio']:.3f}" if 'ratio' in record else '-'
+            lines.append(f"{name:<10} {record['calls']:>6} {record['seconds']:>9.4f} {record['files']:>6} "
+                         f"{record['bytes_in']:>11,} {record['bytes_out']:>11,} {ratio:>6}")
+        lines.append(f"{'total':<10} {'':>6} {report['total_seconds']:>9.4f}")
+        return '\n'.join(lines)
+
+def record(profile, name):
+    """The accumulating record for ``name``, for counts gathered outside a timed block."""
+    return profile.record(name) if profile is not None else _new_record()
+
+def phase(profile, name):
+    """``profile.phase(name)``, or a context yielding a discarded record when profiling is off."""
+    return profile.phase(name) if profile is not None else nullcontext(_new_record())
+
+def add_profile_arguments(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help="Print per-phase timings, file counts, bytes and compression ratio")
+    parser.add_argument('--profile-json', metavar='PATH', help="Write the profile as JSON (implies --profile)")
+
+def profile_from_args(args):
+    return GenerationProfile() if args.profile or args.profile_json else None
+
+def report_profile(profile, args):
+    """Print the table and write the JSON requested on the command line; no-op when not profiling."""
+    if profile is None:
+        return
+    print("\n=== Generation profile ===")
+    print(profile.format_table())
+    if args.profile_json:
+        profile.write_json(args.profile_json)
+        print(f"Profile written to {args.profile_json}")
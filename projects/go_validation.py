@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Optional post-generation check: runs gofmt -l, go build ./... and go vet ./...
+# on every Go module (directory with a go.mod) below a generated project, one
+# worker per module, and groups the diagnostics by file. Without a Go toolchain
+# on PATH the stage is skipped rather than failed.
+
+DEFAULT_TIMEOUT = 300  # Seconds per command; module downloads can be slow
+DIAGNOSTIC = re.compile(r'^(?:vet: )?(\S+?\.go):(\d+)(?::(\d+))?: ?(.*)$')
+MODULE_LEVEL = ''  # Key for problems that do not point at a file (download errors and the like)
+
+def find_go_toolchain():
+    """``(go, gofmt)`` executables, gofmt possibly None; None when Go is not installed."""
+    go = shutil.which('go')
+    if go is None:
+        return None
+    gofmt = shutil.which('gofmt')
+    if gofmt is None:
+        # gofmt ships next to go in GOROOT/bin even when only go is on PATH
+        candidate = os.path.join(os.path.dirname(os.path.realpath(go)), 'gofmt')
+        gofmt = candidate if os.path.isfile(candidate) else None
+    return go, gofmt
+
+def _skipped_dir(name: str) -> bool:
+    # Directories the go tool ignores for ./... patterns
+    return name.startswith(('.', '_')) or name in ('vendor', 'testdata')
+
+def find_go_modules(project_dir):
+    """Directories under ``project_dir`` (inclusive) that contain a go.mod, sorted."""
+    modules = []
+    for root, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = sorted(d for d in dirnames if not _skipped_dir(d))
+        if 'go.mod' in filenames:
+            modules.append(Path(root))
+    return modules
+
+def _module_go_files(module_dir: Path):
+    """The module's own .go files (nested modules excluded), relative to ``module_dir``."""
+    files = []
+    for root, dirnames, filenames in os.walk(module_dir):
+        dirnames[:] = sorted(d for d in dirnames
+                             if not _skipped_dir(d) and not os.path.isfile(os.path.join(root, d, 'go.mod')))
+        files.extend(os.path.relpath(os.path.join(root, f), module_dir) for f in sorted(filenames) if f.endswith('.go'))
+    return files
+
+def _run(cmd, cwd, timeout):
+    """``(returncode, combined output)``; returncode None when the command timed out."""
+    try:
+        result = subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, f"{' '.join(cmd)} timed out after {timeout}s"
+    return result.returncode, result.stdout
+
+def _group_diagnostics(output: str, module_dir: Path, project_dir: Path):
+    """Map ``file relative to project_dir`` -> messages; unmatched lines go under MODULE_LEVEL."""
+    problems = {}
+    for line in output.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith('# '):  # "# package/path" headers from go build/vet
+            continue
+        match = DIAGNOSTIC.match(line)
+        if match:
+            path = Path(os.path.normpath(module_dir / match.group(1))).relative_to(project_dir).as_posix()
+            column = f":{match.group(3)}" if match.group(3) else ''
+            problems.setdefault(path, []).append(f"{match.group(2)}{column}: {match.group(4)}")
+        else:
+            problems.setdefault(MODULE_LEVEL, []).append(line)
+    return problems
+
+def validate_module(module_dir: Path, project_dir: Path, toolchain, timeout=DEFAULT_TIMEOUT):
+    """Run every check in one module; returns ``{'module': ..., 'checks': {name: {'ok', 'problems'}}}``."""
+    go, gofmt = toolchain
+    checks = {}
+    if gofmt is not None:
+        go_files = _module_go_files(module_dir)
+        returncode, output = _run([gofmt, '-l', *go_files], module_dir, timeout) if go_files else (0, '')
+        problems = _group_diagnostics(output, module_dir, project_dir)
+        # Without errors, gofmt -l prints bare file names: those files need reformatting
+        for path in problems.pop(MODULE_LEVEL, []):
+            if path.endswith('.go'):
+                rel = Path(os.path.normpath(module_dir / path)).relative_to(project_dir).as_posix()
+                problems.setdefault(rel, []).append("not gofmt-formatted")
+            else:
+                problems.setdefault(MODULE_LEVEL, []).append(path)
+        checks['gofmt'] = {'ok': returncode == 0 and not problems, 'problems': problems}
+    for name, cmd in (('build', [go, 'build', './...']), ('vet', [go, 'vet', './...'])):
+        returncode, output = _run(cmd, module_dir, timeout)
+        checks[name] = {'ok': returncode == 0, 'problems': _group_diagnostics(output, module_dir, project_dir)}
+    module = module_dir.relative_to(project_dir).as_posix()
+    return {'module': module if module != '.' else './', 'checks': checks}
+
+def validate_project(project_dir, timeout=DEFAULT_TIMEOUT):
+    """Validate every module under ``project_dir`` in parallel; None when no Go toolchain is available."""
+    toolchain = find_go_toolchain()
+    if toolchain is None:
+        return None
+    project_dir = Path(project_dir).resolve()
+    modules = find_go_modules(project_dir)
+    if not modules:
+        return []
+    with ThreadPoolExecutor(max_workers=len(modules)) as executor:
+        return list(executor.map(lambda module: validate_module(module, project_dir, toolchain, timeout), modules))
+
+def failed_checks(results):
+    return sum(not check['ok'] for result in results for check in result['checks'].values())
+
+def print_report(results, out=sys.stdout):
+    for result in results:
+        summary = ', '.join(f"{name} {'ok' if check['ok'] else 'FAILED'}" for name, check in result['checks'].items())
+        print(f"{result['module']}: {summary}", file=out)
+        for name, check in result['checks'].items():
+            for path, messages in sorted(check['problems'].items()):
+                for message in messages:
+                    if not path:
+                        location = message
+                    else:  # "12:5: msg" reads as file:line:col, other notes as "file: note"
+                        location = f"{path}:{message}" if message[:1].isdigit() else f"{path}: {message}"
+                    print(f"  [{name}] {location}", file=out)
+    print(f"{len(results)} module(s) checked, {failed_checks(results)} failed check(s)", file=out)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run gofmt, go build and go vet on every module of a generated project.")
+    parser.add_argument('project_dir', help="Generated project tree")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help="Seconds allowed per command")
+    parser.add_argument('--json', metavar='PATH', help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = validate_project(args.project_dir, timeout=args.timeout)
+    if results is None:
+        print("Go toolchain not found on PATH; skipping validation.")
+        return 0
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed_checks(results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
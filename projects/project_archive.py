@@ -0,0 +1,201 @@
+import argparse
+import os
+import struct
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from generation_profile import phase, record
+
+# Shared archive writer for the project generators. Entries are written in
+# sorted order with a fixed timestamp, fixed permissions and a fixed creator
+# system, so the same project tree always produces a byte-identical ZIP and
+# downstream caches can key on the archive hash.
+#
+# Members are compressed independently with raw deflate (optionally in a
+# process pool) and the headers and central directory are assembled here on
+# the main process, so the output does not depend on the number of workers.
+
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # Earliest timestamp the ZIP format can represent
+FILE_MODE = 0o644
+COMPRESS_LEVEL = 6
+MIN_DEFLATE_SIZE = 64  # Smaller members save a few bytes at best, so they are stored without trying
+
+# Per-extension (deflate level, minimum size worth deflating). A level of None
+# stores the member as-is: these formats are already compressed. The key
+# DEFAULT_KEY sets the policy for every extension not listed.
+COMPRESSION_POLICY = {
+    '.png': (None, 0), '.jpg': (None, 0), '.jpeg': (None, 0), '.gif': (None, 0), '.webp': (None, 0),
+    '.zip': (None, 0), '.gz': (None, 0), '.tgz': (None, 0), '.bz2': (None, 0), '.xz': (None, 0),
+    '.7z': (None, 0), '.jar': (None, 0), '.woff': (None, 0), '.woff2': (None, 0),
+    '.pdf': (None, 0), '.mp3': (None, 0), '.mp4': (None, 0),
+}
+DEFAULT_KEY = '*'
+DEFAULT_COMPRESSION = (COMPRESS_LEVEL, MIN_DEFLATE_SIZE)
+
+_VERSION = 20  # "2.0": deflate, no ZIP64
+_DOS_TIME = (FIXED_DATE_TIME[3] << 11) | (FIXED_DATE_TIME[4] << 5) | (FIXED_DATE_TIME[5] // 2)
+_DOS_DATE = ((FIXED_DATE_TIME[0] - 1980) << 9) | (FIXED_DATE_TIME[1] << 5) | FIXED_DATE_TIME[2]
+_EXTERNAL_ATTR = (0o100000 | FILE_MODE) << 16  # Regular file, rw-r--r--
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+def entry_bytes(content) -> bytes:
+    """Content of an entry: a path on disk (read lazily), text (UTF-8) or bytes."""
+    if isinstance(content, Path):
+        return content.read_bytes()
+    if isinstance(content, str):
+        return content.encode('utf-8')
+    return content
+
+def compression_for(arcname: str, policy=None):
+    """``(level, min_size)`` for ``arcname``: level None means store, as does a member smaller than min_size."""
+    policy = COMPRESSION_POLICY if policy is None else policy
+    return policy.get(os.path.splitext(arcname)[1].lower(), policy.get(DEFAULT_KEY, DEFAULT_COMPRESSION))
+
+def parse_compression_rule(text: str):
+    """Parse ``EXT=LEVEL[:MIN_SIZE]`` into ``(ext, (level, min_size))`` for a policy.
+
+    ``EXT`` is an extension such as ``.go`` or DEFAULT_KEY for all others;
+    ``LEVEL`` is 1-9 or ``store``. Without ``MIN_SIZE``, deflated members use
+    MIN_DEFLATE_SIZE. Raises ``argparse.ArgumentTypeError`` so it can serve as
+    an argparse ``type``.
+    """
+    ext, sep, rule = text.partition('=')
+    level, _, min_size = rule.partition(':')
+    ext = ext.strip().lower()
+    if not sep or not ext or (ext != DEFAULT_KEY and not ext.startswith('.')):
+        raise argparse.ArgumentTypeError(f"expected EXT=LEVEL[:MIN_SIZE] with EXT like .go or '{DEFAULT_KEY}', "
+                                         f"got '{text}'")
+    try:
+        level = None if level == 'store' else int(level)
+        min_size = int(min_size) if min_size else (0 if level is None else MIN_DEFLATE_SIZE)
+        valid = (level is None or 1 <= level <= 9) and min_size >= 0
+    except ValueError:
+        valid = False
+    if not valid:
+        raise argparse.ArgumentTypeError(f"'{text}': LEVEL must be 1-9 or 'store' and MIN_SIZE a byte count")
+    return ext, (level, min_size)
+
+def add_compression_arguments(parser):
+    parser.add_argument('--compress', dest='compression', action='append', default=[], type=parse_compression_rule,
+                        metavar='EXT=LEVEL[:MIN_SIZE]',
+                        help=f"Deflate level (1-9 or 'store') and minimum size for members with this extension; "
+                             f"'{DEFAULT_KEY}' sets it for the rest (repeatable; default: "
+                             f"{COMPRESS_LEVEL}:{MIN_DEFLATE_SIZE})")
+
+def policy_from_args(args):
+    """COMPRESSION_POLICY with the ``--compress`` overrides applied; None when there are none."""
+    return {**COMPRESSION_POLICY, **dict(args.compression)} if args.compression else None
+
+def _compress_entry(job):
+    """Worker: ``(content, level, min_size)`` -> ``(method, crc, file_size, payload, seconds)``."""
+    content, level, min_size = job
+    start = time.perf_counter()
+    data = entry_bytes(content)
+    crc = zlib.crc32(data)
+    if level is not None and len(data) >= min_size:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)  # Raw deflate, as stored in a ZIP
+        payload = compressor.compress(data) + compressor.flush()
+        if len(payload) < len(data):
+            return zipfile.ZIP_DEFLATED, crc, len(data), payload, time.perf_counter() - start
+    return zipfile.ZIP_STORED, crc, len(data), data, time.perf_counter() - start
+
+def write_archive(zip_path, entries, workers=None, policy=None, profile=None):
+    """Write ``(arcname, content)`` entries to ``zip_path`` deterministically, sorted by arcname.
+
+    ``content`` may be bytes, text or a ``Path``; paths are only read when
+    their entry is compressed. With ``workers`` > 1, members are compressed in
+    a process pool; the archive is byte-identical either way. ``policy`` maps
+    lowercase extensions (or DEFAULT_KEY) to ``(level, min_size)`` and defaults
+    to COMPRESSION_POLICY. Members smaller than their ``min_size``, and members
+    that deflate does not shrink, are stored.
+
+    With a ``profile``, "compress" accumulates the per-member compression time
+    (summed across workers) and "zip" the wall time of the whole write.
+    """
+    entries = sorted(entries, key=lambda entry: entry[0])
+    jobs = [(content, *compression_for(arcname, policy)) for arcname, content in entries]
+    if len(entries) >= 0xFFFF:
+        raise ValueError(f"{zip_path}: too many entries for a ZIP without ZIP64")
+
+    executor = ProcessPoolExecutor(workers) if workers and workers > 1 and len(jobs) > 1 else None
+    compress = record(profile, 'compress')
+    compress['calls'] += 1
+    try:
+        if executor:
+            # map() yields in submission order, so members land in sorted order
+            results = executor.map(_compress_entry, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+        else:
+            results = map(_compress_entry, jobs)
+
+        central = []
+        with phase(profile, 'zip') as archive, open(zip_path, 'wb') as zip_file:
+            offset = raw_bytes = 0
+            for (arcname, _), (method, crc, file_size, payload, seconds) in zip(entries, results):
+                compress['seconds'] += seconds
+                compress['files'] += 1
+                compress['bytes_in'] += file_size
+                compress['bytes_out'] += len(payload)
+                raw_bytes += file_size
+                name = arcname.encode('utf-8')
+                flags = 0 if name.isascii() else 0x800  # Bit 11: UTF-8 file name
+                if offset > _ZIP32_LIMIT or file_size > _ZIP32_LIMIT or len(payload) > _ZIP32_LIMIT:
+                    raise ValueError(f"{zip_path}: {arcname} needs ZIP64, which this writer does not produce")
+                fields = (flags, method, _DOS_TIME, _DOS_DATE, crc, len(payload), file_size, len(name))
+                zip_file.write(_LOCAL_HEADER.pack(b'PK\x03\x04', _VERSION, 0, *fields, 0))
+                zip_file.write(name)
+                zip_file.write(payload)
+                central.append(_CENTRAL_HEADER.pack(b'PK\x01\x02', _VERSION, 3, _VERSION, 0, *fields,
+                                                    0, 0, 0, 0, _EXTERNAL_ATTR, offset) + name)
+                offset += _LOCAL_HEADER.size + len(name) + len(payload)
+
+            directory = b''.join(central)
+            if offset > _ZIP32_LIMIT:
+                raise ValueError(f"{zip_path}: archive needs ZIP64, which this writer does not produce")
+            zip_file.write(directory)
+            zip_file.write(_END_RECORD.pack(b'PK\x05\x06', 0, 0, len(central), len(central),
+                                            len(directory), offset, 0))
+            archive['files'] += len(central)
+            archive['bytes_in'] += raw_bytes
+            archive['bytes_out'] += offset + len(directory) + _END_RECORD.size
+    finally:
+        if executor:
+            executor.shutdown()
+
+def zip_files(files, zip_path, prefix: str = '', workers=None, policy=None, profile=None):
+    """Zip an in-memory ``{relative_path: content}`` dict without touching the project tree.
+
+    Keys use ``/`` separators; ``prefix`` is prepended to each arcname.
+    ``policy`` is passed to write_archive(). Returns the number of files
+    written.
+    """
+    write_archive(zip_path, ((prefix + rel_path, content) for rel_path, content in files.items()),
+                  workers=workers, policy=policy, profile=profile)
+    return len(files)
+
+def collect_directory(source_dir, prefix: str = ''):
+    """List ``(arcname, path)`` for every file under ``source_dir``, with POSIX arcnames."""
+    source_dir = Path(source_dir)
+    files = []
+    for root, _, filenames in os.walk(source_dir):
+        for filename in filenames:
+            file_path = Path(root) / filename
+            if file_path.is_file():
+                files.append((prefix + file_path.relative_to(source_dir).as_posix(), file_path))
+    return files
+
+def zip_directory(source_dir, zip_path, prefix: str = '', workers=None, policy=None, profile=None):
+    """Zip a generated project tree reproducibly.
+
+    Arcnames are relative to ``source_dir`` and prefixed with ``prefix`` (for
+    example ``'csv-json-sanitizer/'`` to keep the top-level folder). ``policy``
+    is passed to write_archive(). Returns the number of files written.
+    """
+    files = collect_directory(source_dir, prefix)
+    write_archive(zip_path, files, workers=workers, policy=policy, profile=profile)
+    return len(files)
@@ -0,0 +1,176 @@
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import sys
+import zipfile
+from pathlib import Path
+
+from project_archive import add_compression_arguments, entry_bytes, collect_directory, policy_from_args, write_archive
+from project_spec import available_specs, load_spec, load_variants
+
+# Content-deduplicated bundle of many generated projects in one ZIP:
+#
+#   bundle.json               index: projects, file counts, dedup totals
+#   projects/<name>.json      one manifest per project: [[path, sha256], ...]
+#   blobs/<sha256>            each distinct file content, stored once
+#
+# Variants of the same spec share almost every file (go.mod skeletons,
+# handlers, .env.example), so a bundle of N variants costs little more than
+# one archive. extract rehydrates a single project as a tree, or as a ZIP
+# byte-identical to the one the generator would have written.
+
+BUNDLE_INDEX = 'bundle.json'
+BUNDLE_FORMAT = 1
+
+def _check_name(name: str):
+    if not name or name in ('.', '..') or '/' in name or '\\' in name:
+        raise ValueError(f"project name '{name}' must be a plain file name")
+
+def _safe_path(path: str) -> str:
+    normalised = posixpath.normpath(path)
+    if path.startswith('/') or normalised == '..' or normalised.startswith('../') or ':' in normalised:
+        raise ValueError(f"unsafe path in bundle: {path}")
+    return normalised
+
+def collect_sources(sources):
+    """Expand CLI sources into ``(name, archive_prefix, {path: content})`` projects.
+
+    A source is a spec name, ``spec=params.json`` for one project per
+    parameter set, a ``.zip`` archive, or a directory.
+    """
+    specs = set(available_specs())
+    projects = []
+    for source in sources:
+        spec_name, sep, params_path = source.partition('=')
+        if spec_name in specs:
+            spec = load_spec(spec_name).compile()
+            if not sep:
+                projects.append((spec.name, spec.archive_prefix, spec.files()))
+            else:
+                for name, params in load_variants(params_path, spec.name):
+                    projects.append((name, spec.archive_prefix, spec.files(spec.resolve(params))))
+        elif source.lower().endswith('.zip'):
+            with zipfile.ZipFile(source) as zip_file:
+                files = {info.filename: zip_file.read(info) for info in zip_file.infolist() if not info.is_dir()}
+            projects.append((Path(source).stem, '', files))
+        elif os.path.isdir(source):
+            projects.append((Path(source).resolve().name, '', dict(collect_directory(source))))
+        else:
+            raise ValueError(f"'{source}' is not a spec name, a .zip or a directory")
+    return projects
+
+def build_bundle(bundle_path, projects, workers=None, stats=None, policy=None):
+    """Write ``projects`` (from collect_sources) to one deduplicated bundle ZIP.
+
+    ``policy`` is passed to write_archive().
+    """
+    blobs = {}  # sha256 -> bytes
+    manifests = []
+    index = {'format': BUNDLE_FORMAT, 'projects': []}
+    total_files = total_bytes = 0
+    for name, prefix, files in projects:
+        _check_name(name)
+        if any(entry['name'] == name for entry in index['projects']):
+            raise ValueError(f"duplicate project name '{name}'")
+        refs = []
+        for path, content in sorted(files.items()):
+            data = entry_bytes(content)
+            digest = hashlib.sha256(data).hexdigest()
+            blobs.setdefault(digest, data)
+            refs.append([_safe_path(path), digest])
+            total_bytes += len(data)
+        total_files += len(refs)
+        manifest = {'name': name, 'archive_prefix': prefix, 'files': refs}
+        manifests.append((f"projects/{name}.json", json.dumps(manifest, indent=1) + '\n'))
+        index['projects'].append({'name': name, 'files': len(refs)})
+
+    unique_bytes = sum(len(data) for data in blobs.values())
+    index.update(files=total_files, blobs=len(blobs), bytes=total_bytes, unique_bytes=unique_bytes)
+    entries = [(f"blobs/{digest}", data) for digest, data in blobs.items()]
+    entries += manifests
+    entries.append((BUNDLE_INDEX, json.dumps(index, indent=1) + '\n'))
+    write_archive(bundle_path, entries, workers=workers, policy=policy)
+    if stats is not None:
+        stats.update(projects=len(manifests), files=total_files, blobs=len(blobs),
+                     bytes=total_bytes, unique_bytes=unique_bytes)
+    return bundle_path
+
+def read_index(bundle: zipfile.ZipFile):
+    index = json.loads(bundle.read(BUNDLE_INDEX))
+    if index.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"unsupported bundle format {index.get('format')!r}")
+    return index
+
+def extract_project(bundle_path, name, output_path, policy=None):
+    """Rehydrate project ``name`` into a directory, or into a ZIP when ``output_path`` ends in .zip.
+
+    Blobs are checked against their hash. The ZIP matches the generator's own
+    archive for the same files and compression ``policy``. Returns the number
+    of files.
+    """
+    _check_name(name)
+    with zipfile.ZipFile(bundle_path) as bundle:
+        read_index(bundle)
+        try:
+            manifest = json.loads(bundle.read(f"projects/{name}.json"))
+        except KeyError:
+            raise ValueError(f"{bundle_path}: no project named '{name}'") from None
+
+        def blob(digest):
+            data = bundle.read(f"blobs/{digest}")
+            if hashlib.sha256(data).hexdigest() != digest:
+                raise ValueError(f"{bundle_path}: blob {digest} is corrupt")
+            return data
+
+        files = manifest['files']
+        if str(output_path).lower().endswith('.zip'):
+            prefix = manifest['archive_prefix']
+            write_archive(output_path, [(prefix + _safe_path(path), blob(digest)) for path, digest in files],
+                          policy=policy)
+        else:
+            for path, digest in files:
+                target = Path(output_path, *_safe_path(path).split('/'))
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(blob(digest))
+    return len(files)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle many generated projects into one deduplicated ZIP, "
+                                                 "or extract one of them.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="Create a bundle")
+    build.add_argument('bundle', help="Output bundle (.zip)")
+    build.add_argument('sources', nargs='+',
+                       help="Spec name, SPEC=params.json (one project per parameter set), .zip archive or directory")
+    build.add_argument('--jobs', type=int, default=1, help="Compress blobs in this many processes (default: 1)")
+    add_compression_arguments(build)
+    listing = commands.add_parser('list', help="List the projects in a bundle")
+    listing.add_argument('bundle')
+    extract = commands.add_parser('extract', help="Rehydrate one project")
+    extract.add_argument('bundle')
+    extract.add_argument('project', help="Project name (see list)")
+    extract.add_argument('-o', '--output', required=True, help="Output directory, or a path ending in .zip")
+    add_compression_arguments(extract)
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'build':
+            stats = {}
+            build_bundle(args.bundle, collect_sources(args.sources), workers=args.jobs, stats=stats,
+                         policy=policy_from_args(args))
+            print(f"Bundled {stats['projects']} project(s), {stats['files']} files into {args.bundle}: "
+                  f"{stats['blobs']} unique blobs, {stats['unique_bytes']:,} of {stats['bytes']:,} bytes kept")
+        elif args.command == 'list':
+            with zipfile.ZipFile(args.bundle) as bundle:
+                for entry in read_index(bundle)['projects']:
+                    print(f"{entry['name']} ({entry['files']} files)")
+        else:
+            count = extract_project(args.bundle, args.project, args.output, policy=policy_from_args(args))
+            print(f"Extracted {count} files of {args.project} to {args.output}")
+    except (ValueError, OSError, zipfile.BadZipFile) as e:
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import argparse
+import sys
+import tempfile
+import time
+
+from generation_profile import add_profile_arguments, phase, profile_from_args, report_profile
+from go_validation import failed_checks, print_report, validate_project
+from project_archive import add_compression_arguments, policy_from_args
+from project_spec import (available_specs, format_sync_stats, load_spec, load_variants, write_project,
+                          zip_project, zip_variants)
+
+# Single entry point for every generator spec under specs/. Only the chosen
+# project's manifest and templates are read.
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a Go project from its spec in projects/specs/.")
+    parser.add_argument('project', nargs='?', help="Spec name (see --list)")
+    parser.add_argument('--list', action='store_true', help="List the available specs and exit")
+    parser.add_argument('-o', '--output-dir', default='.', help="Where the tree and ZIP are written (default: .)")
+    parser.add_argument('--in-memory', action='store_true',
+                        help="Build the ZIP straight from the templates without writing the project tree")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Processes used to compress members, or to build archives with --batch (default: 1)")
+    parser.add_argument('--prune', action='store_true',
+                        help="Delete previously generated files that the spec no longer lists")
+    parser.add_argument('--set', dest='params', action='append', default=[], metavar='NAME=VALUE',
+                        help="Override a template parameter (repeatable; see --list-params)")
+    parser.add_argument('--list-params', action='store_true', help="Show the project's parameters and defaults")
+    parser.add_argument('--validate', action='store_true',
+                        help="Run gofmt -l, go build and go vet on every generated module (skipped without Go)")
+    parser.add_argument('--batch', metavar='PARAMS_JSON',
+                        help="Render every parameter set in this JSON list into its own <name>.zip")
+    add_compression_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile = profile_from_args(args)
+    policy = policy_from_args(args)
+
+    names = available_specs()
+    if args.list or not args.project:
+        print('\n'.join(names))
+        return
+    if args.project not in names:
+        parser.error(f"unknown project '{args.project}' (choose from: {', '.join(names)})")
+
+    with phase(profile, 'load'):
+        spec = load_spec(args.project)
+    if args.list_params:
+        for name, default in spec.parameters.items():
+            print(f"{name} = {default}")
+        return
+
+    params = {}
+    for item in args.params:
+        name, sep, value = item.partition('=')
+        if not sep:
+            parser.error(f"--set expects NAME=VALUE, got '{item}'")
+        params[name] = value
+    try:
+        spec.resolve(params)
+        if args.batch:
+            variants = [(name, {**params, **overrides}) for name, overrides in load_variants(args.batch, spec.name)]
+            start = time.perf_counter()
+            with phase(profile, 'batch') as batch:
+                paths = zip_variants(spec, variants, args.output_dir, jobs=args.jobs, policy=policy)
+                batch['files'] += len(paths)
+            print(f"Built {len(paths)} archive(s) in {args.output_dir} in {time.perf_counter() - start:.2f}s")
+            report_profile(profile, args)
+            return
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Render once; the tree, the archive and any validation copy are all written from this dict
+    files = spec.files(spec.resolve(params), profile)
+    if not args.in_memory:
+        stats = {}
+        project_dir = write_project(spec, args.output_dir, prune=args.prune, stats=stats, profile=profile,
+                                    files=files)
+        print(f"Project files in {project_dir}: {format_sync_stats(stats)}")
+    zip_path = zip_project(spec, args.output_dir, workers=args.jobs, profile=profile, files=files, policy=policy)
+    print(f"Project zipped as {zip_path}")
+
+    failures = 0
+    if args.validate:
+        with tempfile.TemporaryDirectory() as scratch:
+            # --in-memory leaves no tree behind, so validate a scratch copy
+            project_dir = project_dir if not args.in_memory else write_project(spec, scratch, files=files)
+            with phase(profile, 'validate'):
+                results = validate_project(project_dir)
+            if results is None:
+                print("Go toolchain not found on PATH; skipping validation.")
+            else:
+                print(f"\n=== Go validation ({project_dir}) ===")
+                print_report(results)
+                failures = failed_checks(results)
+
+    if spec.instructions:
+        print("\n=== Setup Instructions ===")
+        for step, line in enumerate(spec.instructions, 1):
+            print(f"{step}. {line}")
+    report_profile(profile, args)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from generation_profile import phase
+from project_archive import zip_files
+
+# Declarative project specs. Each generator lives in specs/<name>/ as a
+# manifest.json plus one template per generated file:
+#
+#   specs/banking-api/manifest.json
+#   specs/banking-api/templates/go.mod.tmpl
+#   specs/banking-api/templates/cmd/server/main.go.tmpl
+#
+# Loading a spec only parses its manifest; templates are read and compiled
+# the first time a file is rendered, so listing or picking a project costs
+# the same however large the templates are.
+#
+# Templates may reference the parameters declared in the manifest as
+# ``{{ name }}``; the manifest also holds their defaults. Anything else that
+# looks like a placeholder (Go composite literals, say) is left alone.
+
+SPECS_DIR = Path(__file__).resolve().parent / 'specs'
+MANIFEST_NAME = 'manifest.json'
+GENERATED_SUFFIX = '.generated-files'  # Beside each written tree: the paths the last run generated, for --prune
+TEMPLATE_SUFFIX = '.tmpl'
+PLACEHOLDER = re.compile(r'\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}')
+
+class Template:
+    """Template text split once into literal runs and parameter names, for cheap repeated rendering."""
+
+    def __init__(self, text: str, parameters):
+        self.literals = []  # One more literal than names: text before, between and after placeholders
+        self.names = []
+        start = 0
+        for match in PLACEHOLDER.finditer(text):
+            if match.group(1) in parameters:
+                self.literals.append(text[start:match.start()])
+                self.names.append(match.group(1))
+                start = match.end()
+        self.literals.append(text[start:])
+
+    def render(self, values) -> str:
+        if not self.names:
+            return self.literals[0]
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            parts.append(values[name])
+            parts.append(literal)
+        return ''.join(parts)
+
+class ProjectSpec:
+    """One generated project: where it goes, which files it has and their templates."""
+
+    def __init__(self, spec_dir, manifest):
+        self.spec_dir = Path(spec_dir)
+        self.name = manifest['name']
+        self.root = manifest.get('root', self.name)  # Output directory for the tree
+        self.archive = manifest.get('archive', f"{self.name}.zip")
+        self.archive_prefix = manifest.get('archive_prefix', '')
+        self.instructions = manifest.get('instructions', [])
+        self.parameters = {name: str(value) for name, value in manifest.get('parameters', {}).items()}
+        self.paths = manifest['files']  # Relative POSIX paths, in generation order
+        self._templates = {}
+
+    def template_path(self, rel_path: str) -> Path:
+        return self.spec_dir / 'templates' / (rel_path + TEMPLATE_SUFFIX)
+
+    def template(self, rel_path: str) -> Template:
+        """Compiled template for ``rel_path``, read from disk on first use."""
+        template = self._templates.get(rel_path)
+        if template is None:
+            # newline='' keeps the template's line endings exactly as stored
+            with open(self.template_path(rel_path), 'r', encoding='utf-8', newline='') as f:
+                template = self._templates[rel_path] = Template(f.read(), self.parameters)
+        return template
+
+    def compile(self):
+        """Read and compile every template up front (before rendering many variants)."""
+        for rel_path in self.paths:
+            self.template(rel_path)
+        return self
+
+    def resolve(self, overrides=None) -> dict:
+        """Defaults merged with ``overrides``; raises ValueError for parameters the spec does not declare."""
+        overrides = overrides or {}
+        unknown = sorted(set(overrides) - set(self.parameters))
+        if unknown:
+            raise ValueError(f"{self.name}: unknown parameter(s) {', '.join(unknown)}; "
+                             f"expected one of {', '.join(sorted(self.parameters)) or '(none)'}")
+        return {**self.parameters, **{name: str(value) for name, value in overrides.items()}}
+
+    def render(self, rel_path: str, values=None) -> str:
+        """Content of one generated file; ``values`` is a full mapping from resolve() (defaults if None)."""
+        return self.template(rel_path).render(self.parameters if values is None else values)
+
+    def files(self, values=None, profile=None):
+        """``{rel_path: content}`` for every generated file."""
+        with phase(profile, 'render') as render:
+            files = {rel_path: self.render(rel_path, values) for rel_path in self.paths}
+            render['files'] += len(files)
+        return files
+
+def available_specs(specs_dir=SPECS_DIR):
+    """Names of all specs under ``specs_dir``, reading nothing but the directory listing."""
+    return sorted(entry.name for entry in os.scandir(specs_dir)
+                  if entry.is_dir() and os.path.isfile(os.path.join(entry.path, MANIFEST_NAME)))
+
+def load_spec(name: str, specs_dir=SPECS_DIR) -> ProjectSpec:
+    """Parse ``specs/<name>/manifest.json``; raises FileNotFoundError for unknown specs."""
+    spec_dir = Path(specs_dir) / name
+    with open(spec_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        return ProjectSpec(spec_dir, json.load(f))
+
+def _file_digest(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.digest()
+
+def sync_file(path: Path, content: str) -> bool:
+    """Write ``content`` to ``path`` unless the file already holds exactly that; True if written.
+
+    Unchanged files keep their mtime, so Go build caches and editors leave
+    them alone.
+    """
+    data = content.encode('utf-8')
+    try:
+        if path.stat().st_size == len(data) and _file_digest(path) == hashlib.sha256(data).digest():
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+def generated_list_path(project_dir: Path) -> Path:
+    """Where the list of generated paths is kept: a hidden file beside the tree, never inside it.
+
+    Keeping it out of the tree means archives, bundles and Markdown built from
+    the tree never pick it up.
+    """
+    return project_dir.parent / f".{project_dir.name}{GENERATED_SUFFIX}"
+
+def read_generated(project_dir: Path) -> list:
+    """Paths recorded in ``project_dir``'s generated list; empty if the tree has none yet."""
+    try:
+        with open(generated_list_path(project_dir), 'r', encoding='utf-8') as f:
+            return [line for line in f.read().splitlines() if line]
+    except FileNotFoundError:
+        return []
+
+def record_generated(project_dir: Path, rel_paths):
+    """Store ``rel_paths`` as the tree's generated list (left untouched if unchanged)."""
+    sync_file(generated_list_path(project_dir), ''.join(f"{rel_path}\n" for rel_path in rel_paths))
+
+def remove_stale(project_dir: Path, rel_paths) -> int:
+    """Delete previously generated files that are not in ``rel_paths``; returns the count.
+
+    Only paths in the tree's generated list are candidates, so files the user
+    or the Go tooling added (.env, go.sum, ...) are never touched. Absolute
+    paths and paths that resolve outside ``project_dir`` are ignored.
+    Directories left empty by a deletion are removed too, up to but never
+    including ``project_dir``.
+    """
+    root = project_dir.resolve()
+    keep = set(rel_paths)
+    removed = 0
+    for rel_path in read_generated(project_dir):
+        if rel_path in keep or Path(rel_path).is_absolute():
+            continue
+        path = (root / rel_path).resolve()
+        if path == root or not path.is_relative_to(root):
+            continue
+        try:
+            path.unlink()
+        except (FileNotFoundError, IsADirectoryError):
+            continue
+        removed += 1
+        parent = path.parent
+        while parent != root and parent.is_relative_to(root) and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    return removed
+
+def make_directories(project_dir: Path, rel_paths, profile=None):
+    """Create every parent directory the files need, once each."""
+    with phase(profile, 'mkdir') as mkdir:
+        for directory in sorted({(project_dir / rel_path).parent for rel_path in rel_paths}):
+            directory.mkdir(parents=True, exist_ok=True)
+            mkdir['files'] += 1
+
+def write_files(files, profile=None, on_write=None):
+    """sync_file() every ``{path: content}`` entry; returns the number actually written.
+
+    ``on_write(path)`` is called after each file that was written.
+    """
+    written = 0
+    with phase(profile, 'write') as write:
+        for path, content in files.items():
+            if sync_file(path, content):
+                written += 1
+                write['bytes_out'] += len(content.encode('utf-8'))
+                if on_write is not None:
+                    on_write(path)
+        write['files'] += written
+    return written
+
+def write_project(spec: ProjectSpec, output_dir='.', prune=False, stats=None, params=None, profile=None,
+                  files=None, on_write=None):
+    """Write the project tree to ``output_dir/<spec.root>``; returns the project directory.
+
+    Files whose content is already current are skipped. The generated paths
+    are recorded in the tree's generated list; with ``prune``, files an earlier
+    run generated that are no longer in the spec are deleted. ``stats`` (a
+    dict) receives ``written``, ``skipped`` and ``removed`` counts. ``params``
+    overrides the spec's parameter defaults; ``files`` is an already rendered
+    ``{rel_path: content}`` dict to write instead. ``on_write`` is passed to
+    write_files().
+    """
+    project_dir = Path(output_dir) / spec.root
+    if files is None:
+        files = spec.files(spec.resolve(params), profile)
+    make_directories(project_dir, files, profile)
+    written = write_files({project_dir / rel_path: content for rel_path, content in files.items()}, profile,
+                          on_write)
+    removed = remove_stale(project_dir, files) if prune else 0
+    record_generated(project_dir, files)
+    if stats is not None:
+        stats.update(written=written, skipped=len(files) - written, removed=removed)
+    return project_dir
+
+def format_sync_stats(stats) -> str:
+    return f"{stats['written']} written, {stats['skipped']} unchanged, {stats['removed']} removed"
+
+def zip_project(spec: ProjectSpec, output_dir='.', workers=1, params=None, profile=None, files=None, policy=None):
+    """Build ``output_dir/<spec.archive>`` straight from the templates; returns the archive path.
+
+    ``files`` is an already rendered ``{rel_path: content}`` dict to archive
+    instead. ``policy`` is the compression policy for write_archive().
+    """
+    zip_path = Path(output_dir) / spec.archive
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    if files is None:
+        files = spec.files(spec.resolve(params), profile)
+    zip_files(files, zip_path, prefix=spec.archive_prefix, workers=workers, policy=policy, profile=profile)
+    return zip_path
+
+_batch_spec = None  # Compiled spec in each batch worker process
+_batch_policy = None  # And the compression policy its archives use
+
+def _init_batch_worker(spec, policy=None):
+    global _batch_spec, _batch_policy
+    _batch_spec = spec
+    _batch_policy = policy
+
+def _zip_variant(job):
+    zip_path, values = job
+    zip_files(_batch_spec.files(values), zip_path, prefix=_batch_spec.archive_prefix, policy=_batch_policy)
+    return zip_path
+
+def zip_variants(spec: ProjectSpec, variants, output_dir='.', jobs=1, policy=None):
+    """Render ``(name, params)`` variants into ``output_dir/<name>.zip``, ``jobs`` archives at a time.
+
+    Templates are compiled once and shipped to each worker process once, so
+    the per-variant cost is substitution plus compression. Parameters are
+    validated before any archive is written. ``policy`` is the compression
+    policy for write_archive(). Returns the archive paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    work = []
+    seen = set()
+    for name, params in variants:
+        if not name or name in ('.', '..') or os.path.basename(name) != name:
+            raise ValueError(f"{spec.name}: variant name '{name}' must be a plain file name")
+        if name in seen:
+            raise ValueError(f"{spec.name}: duplicate variant name '{name}'")
+        seen.add(name)
+        work.append((Path(output_dir) / f"{name}.zip", spec.resolve(params)))
+
+    spec.compile()
+    if jobs <= 1 or len(work) <= 1:
+        _init_batch_worker(spec, policy)
+        return [_zip_variant(job) for job in work]
+    with ProcessPoolExecutor(jobs, initializer=_init_batch_worker, initargs=(spec, policy)) as executor:
+        return list(executor.map(_zip_variant, work, chunksize=max(1, len(work) // (jobs * 4))))
+
+def load_variants(path, spec_name: str):
+    """Read a batch file: a JSON list of parameter objects, each with an optional ``"name"``."""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError(f"{path}: expected a JSON list of parameter objects")
+    variants = []
+    for index, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: entry {index} is not a JSON object")
+        params = dict(entry)
+        variants.append((str(params.pop('name', f"{spec_name}-{index:03d}")), params))
+    return variants